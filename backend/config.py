@@ -16,4 +16,59 @@ MAX_FAILURES = int(os.getenv("MAX_FAILURES", 5))
 LOCK_TIME_MINUTES = int(os.getenv("LOCK_TIME_MINUTES", 5))
 DEFAULT_ROOT_ACCOUNT_ID = os.getenv("DEFAULT_ROOT_ACCOUNT_ID", "root")
 DEFAULT_ROOT_ACCOUNT_PASSWORD = os.getenv("DEFAULT_ROOT_ACCOUNT_PASSWORD", "root1234")
-REHASH_COUNT_STANDARD = int(os.getenv("REHASH_COUNT_STANDARD", 10))
\ No newline at end of file
+REHASH_COUNT_STANDARD = int(os.getenv("REHASH_COUNT_STANDARD", 10))
+CRAWLER_MAX_WORKERS = int(os.getenv("CRAWLER_MAX_WORKERS", 10))
+CRAWLER_MAX_PER_HOST = int(os.getenv("CRAWLER_MAX_PER_HOST", 5))
+CRAWLER_MAX_PAGES = int(os.getenv("CRAWLER_MAX_PAGES", 500))
+SCAN_MAX_CONCURRENCY = int(os.getenv("SCAN_MAX_CONCURRENCY", 20))
+SCAN_MAX_PER_SCAN = int(os.getenv("SCAN_MAX_PER_SCAN", 10))
+SCAN_MAX_PER_USER = int(os.getenv("SCAN_MAX_PER_USER", 10))
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", 200))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 10))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", 300))
+HTTP_KEEPALIVE_TIMEOUT = int(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30))
+DNS_CACHE_TTL = int(os.getenv("DNS_CACHE_TTL", 300))
+DNS_NEGATIVE_CACHE_TTL = int(os.getenv("DNS_NEGATIVE_CACHE_TTL", 60))
+DNS_CONCURRENCY = int(os.getenv("DNS_CONCURRENCY", 100))
+ANALYZER_MAX_CONCURRENCY = int(os.getenv("ANALYZER_MAX_CONCURRENCY", 10))
+ANALYZER_REQUEST_TIMEOUT = int(os.getenv("ANALYZER_REQUEST_TIMEOUT", 10))
+ANALYZER_DEADLINE = int(os.getenv("ANALYZER_DEADLINE", 60))
+SCRIPT_CACHE_MAX_ENTRIES = int(os.getenv("SCRIPT_CACHE_MAX_ENTRIES", 5000))
+SCRIPT_CACHE_FRESH_SECONDS = int(os.getenv("SCRIPT_CACHE_FRESH_SECONDS", 3600))
+SCRIPT_CACHE_TTL_SECONDS = int(os.getenv("SCRIPT_CACHE_TTL_SECONDS", 604800))
+SCRIPT_CACHE_MONGODB = os.getenv("SCRIPT_CACHE_MONGODB", "true")
+SUBDOMAIN_CACHE_TTL_SECONDS = int(os.getenv("SUBDOMAIN_CACHE_TTL_SECONDS", 86400))
+SUBDOMAIN_CACHE_EXPIRE_SECONDS = int(os.getenv("SUBDOMAIN_CACHE_EXPIRE_SECONDS", 2592000))
+SUBDOMAIN_CACHE_MONGODB = os.getenv("SUBDOMAIN_CACHE_MONGODB", "true")
+SUBDOMAIN_SCAN_DEADLINE = int(os.getenv("SUBDOMAIN_SCAN_DEADLINE", 45))
+SUBDOMAIN_SOURCES = os.getenv("SUBDOMAIN_SOURCES", "crt.sh,virustotal,hackertarget,threatcrowd")
+SUBDOMAIN_FIXTURE_FILE = os.getenv("SUBDOMAIN_FIXTURE_FILE", "")
+SUBDOMAIN_ZONE_FILE = os.getenv("SUBDOMAIN_ZONE_FILE", "")
+SUBDOMAIN_ACTIVE_SCAN = os.getenv("SUBDOMAIN_ACTIVE_SCAN", "false")
+SUBDOMAIN_NAMESERVERS = os.getenv("SUBDOMAIN_NAMESERVERS", "8.8.8.8,1.1.1.1")
+SUBDOMAIN_WORDLIST = os.getenv("SUBDOMAIN_WORDLIST", "")
+DNS_BRUTEFORCE_CONCURRENCY = int(os.getenv("DNS_BRUTEFORCE_CONCURRENCY", 500))
+DNS_BRUTEFORCE_TIMEOUT = float(os.getenv("DNS_BRUTEFORCE_TIMEOUT", 2))
+DNS_BRUTEFORCE_RETRIES = int(os.getenv("DNS_BRUTEFORCE_RETRIES", 2))
+DNS_BRUTEFORCE_MAX_CANDIDATES = int(os.getenv("DNS_BRUTEFORCE_MAX_CANDIDATES", 20000))
+DNS_BRUTEFORCE_DEADLINE = int(os.getenv("DNS_BRUTEFORCE_DEADLINE", 60))
+PUBLIC_SUFFIX_FILE = os.getenv("PUBLIC_SUFFIX_FILE", "")
+LIVENESS_CONCURRENCY = int(os.getenv("LIVENESS_CONCURRENCY", 100))
+LIVENESS_CONNECT_TIMEOUT = int(os.getenv("LIVENESS_CONNECT_TIMEOUT", 3))
+LIVENESS_REQUEST_TIMEOUT = int(os.getenv("LIVENESS_REQUEST_TIMEOUT", 8))
+LIVENESS_BODY_BYTES = int(os.getenv("LIVENESS_BODY_BYTES", 65536))
+VALIDATE_URL_CONNECT_TIMEOUT = int(os.getenv("VALIDATE_URL_CONNECT_TIMEOUT", 5))
+VALIDATE_URL_READ_TIMEOUT = int(os.getenv("VALIDATE_URL_READ_TIMEOUT", 10))
+VALIDATE_URL_CACHE_TTL = int(os.getenv("VALIDATE_URL_CACHE_TTL", 60))
+VALIDATE_URL_NEGATIVE_CACHE_TTL = int(os.getenv("VALIDATE_URL_NEGATIVE_CACHE_TTL", 10))
+CRAWLER_MAX_DEPTH = int(os.getenv("CRAWLER_MAX_DEPTH", 2))
+CRAWLER_MAX_BYTES = int(os.getenv("CRAWLER_MAX_BYTES", 50 * 1024 * 1024))
+CRAWLER_MAX_SECONDS = int(os.getenv("CRAWLER_MAX_SECONDS", 120))
+CRAWLER_MAX_SITEMAPS = int(os.getenv("CRAWLER_MAX_SITEMAPS", 5))
+SITE_FILE_CACHE_TTL = int(os.getenv("SITE_FILE_CACHE_TTL", 300))
+SITE_FILE_MAX_BYTES = int(os.getenv("SITE_FILE_MAX_BYTES", 5 * 1024 * 1024))
+CRAWLER_MAX_PAGE_BYTES = int(os.getenv("CRAWLER_MAX_PAGE_BYTES", 2 * 1024 * 1024))
+CRAWLER_CLUSTER_SAMPLES = int(os.getenv("CRAWLER_CLUSTER_SAMPLES", 3))
+CRAWLER_SIMHASH_DISTANCE = int(os.getenv("CRAWLER_SIMHASH_DISTANCE", 3))
+CVE_INDEX_REFRESH_SECONDS = int(os.getenv("CVE_INDEX_REFRESH_SECONDS", 60))
+CVE_INGEST_BATCH_SIZE = int(os.getenv("CVE_INGEST_BATCH_SIZE", 1000))
@@ -1,28 +1,142 @@
-import json
-from backend.database.mongodb import cve_collection
+import sys
+import time
+from datetime import datetime, timezone
+from pymongo import ReplaceOne
+from backend.config import CVE_INGEST_BATCH_SIZE
+from backend.database.mongodb import cve_collection, meta_collection
+from backend.database.indexes import create_indexes
+from backend.crawler.cve_index import CVE_META_ID, normalize_product
+from backend.crawler.jsonstream import iter_json_array_file
 
 json_file_path = 'backend/core/json/cve.json'
 
-def load_json_file(file_path):
-    with open(file_path, 'r') as file:
-        return json.load(file)
-    
-def insert_json_to_db(collection, data):
-    collection.delete_many({})
-    
-    if 'cve_list' in data:
-        collection.insert_many(data['cve_list'])
-    else:
-        print("Check your json file again.")
-        
+# 한 CVE가 endpoint마다 따로 들어 있으므로 (CVE 번호, endpoint)가 문서 하나
+CVE_KEY_FIELDS = ("cve number", "endpoint")
+
+# 새 데이터를 먼저 채우는 컬렉션, 다 채운 뒤 이름을 바꿔 cve 컬렉션과 교체
+STAGING_SUFFIX = "_staging"
+
+
+def normalize_text(value):
+    return value.strip().lower()
+
+
+def normalize_affected(affected):
+    entries = []
+    for entry in affected if isinstance(affected, list) else ():
+        if not isinstance(entry, dict):
+            continue
+        product = normalize_product(entry.get("product"))
+        if not product:
+            continue
+        normalized = {"product": product}
+        for field in ("introduced", "fixed", "last_affected"):
+            if entry.get(field) not in (None, ""):
+                normalized[field] = str(entry[field]).strip()
+        entries.append(normalized)
+    return entries
+
+
+def normalize_record(record):
+    """피드의 CVE 항목 하나를 저장 형태로 바꾼다. CVE 번호가 없으면 None."""
+    if not isinstance(record, dict):
+        return None
+    cve_number = record.get("cve number")
+    if not isinstance(cve_number, str) or not cve_number.strip():
+        return None
+
+    document = dict(record)
+    document.pop("_id", None)
+    document["cve number"] = cve_number.strip().upper()
+    # 매칭은 소문자 비교이므로 저장할 때 미리 소문자로 맞춤
+    # 없는 필드는 그대로 없는 채로 둠 ({"os": ""} 조건은 빈 문자열로 적힌 항목에만 일치해야 함)
+    for field in ("os", "technology", "framework"):
+        if isinstance(record.get(field), str):
+            document[field] = normalize_text(record[field])
+    if isinstance(record.get("endpoint"), str):
+        document["endpoint"] = record["endpoint"].strip()
+    if "cvss" in record:
+        document["cvss"] = str(record["cvss"])
+    if "affected" in record:
+        document["affected"] = normalize_affected(record["affected"])
+    return document
+
+
+def write_batch(collection, documents):
+    collection.bulk_write(
+        # endpoint가 없는 항목은 {"endpoint": None} 조건으로 필드가 없는 문서와 짝지어짐
+        [ReplaceOne({field: document.get(field) for field in CVE_KEY_FIELDS}, document, upsert=True) for document in documents],
+        ordered=False,
+    )
+
+
+def ingest_file(file, collection=None, batch_size=CVE_INGEST_BATCH_SIZE):
+    """
+    {"cve_list": [...]} 피드를 조각 단위로 읽어 staging 컬렉션에 나눠 upsert한 뒤 rename으로 한 번에 교체한다.
+    교체 전까지는 기존 cve 컬렉션을 그대로 쓰므로 실행 중인 스캔이 빈 CVE 목록을 보는 일이 없다.
+    반환값: (저장한 문서 수, 건너뛴 항목 수), 교체하지 않았으면 None
+    """
+    collection = cve_collection if collection is None else collection
+    staging = collection.database.get_collection(collection.name + STAGING_SUFFIX)
+    staging.drop()
+    # rename 후에도 인덱스가 유지되므로 cve 컬렉션용 인덱스를 미리 만듦
+    create_indexes(staging, "cve")
+
+    started = time.perf_counter()
+    stored, skipped = 0, 0
+    batch = []
+    try:
+        for record in iter_json_array_file(file, key="cve_list"):
+            document = normalize_record(record)
+            if document is None:
+                skipped += 1
+                continue
+            batch.append(document)
+            if len(batch) >= batch_size:
+                write_batch(staging, batch)
+                stored += len(batch)
+                batch = []
+        if batch:
+            write_batch(staging, batch)
+            stored += len(batch)
+    except ValueError as e:
+        print(f"Check your json file again. ({e})")
+        staging.drop()
+        return None
+
+    if stored == 0:
+        # 빈 피드로 기존 데이터를 지우지 않음
+        print("Check your json file again. (no CVE records)")
+        staging.drop()
+        return None
+
+    staging.rename(collection.name, dropTarget=True)
+    bump_version()
+    print(
+        f"CVE feed ingested: {stored} records written, "
+        f"{skipped} skipped ({time.perf_counter() - started:.1f}s)"
+    )
+    return stored, skipped
+
+
+def bump_version():
+    # 실행 중인 서버의 CVE 색인이 새 데이터를 다시 읽도록 버전을 올림
+    meta_collection.update_one(
+        {"_id": CVE_META_ID},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+
+
 def main():
-    data = load_json_file(json_file_path)
-    
-    insert_json_to_db(cve_collection, data)
-    
-    print("Data successfully loaded into MongoDB.")
+    file_path = sys.argv[1] if len(sys.argv) > 1 else json_file_path
+    with open(file_path, 'rb') as file:
+        result = ingest_file(file)
+
+    if result is not None:
+        print("Data successfully loaded into MongoDB.")
     
 if __name__ == "__main__":
     main()
 
-# run "python -m backend.core.cve"
\ No newline at end of file
+# run "python -m backend.core.cve [feed.json]"
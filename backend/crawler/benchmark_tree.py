@@ -0,0 +1,52 @@
+import random
+import time
+from backend.crawler.get_subdomains_directory import SubdomainDirectoryCrawler
+
+NODE_COUNT = 10000
+LOOKUP_COUNT = 1000
+
+
+def build_synthetic_tree(node_count, fanout=8, seed=0):
+    # 크롤러와 같은 형태의 트리와 URL 인덱스를 함께 생성
+    rnd = random.Random(seed)
+    root = {"url": "https://example.com/", "details": None, "children": []}
+    nodes = [root]
+    node_index = {root["url"]: root}
+    for i in range(1, node_count):
+        parent = nodes[rnd.randrange(max(1, len(nodes) // fanout))]
+        child = {"url": f"https://example.com/page/{i}", "details": None, "children": []}
+        parent["children"].append(child)
+        nodes.append(child)
+        node_index[child["url"]] = child
+    return root, node_index
+
+
+def benchmark(node_count=NODE_COUNT, lookup_count=LOOKUP_COUNT):
+    tree, node_index = build_synthetic_tree(node_count)
+    targets = random.Random(1).sample(list(node_index), lookup_count)
+
+    start = time.perf_counter()
+    for url in targets:
+        SubdomainDirectoryCrawler.find_node(tree, url)
+    recursive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for url in targets:
+        node_index.get(url)
+    index_time = time.perf_counter() - start
+
+    return recursive_time, index_time
+
+
+def main():
+    recursive_time, index_time = benchmark()
+    print(f"Tree size: {NODE_COUNT} nodes, {LOOKUP_COUNT} lookups")
+    print(f"find_node (recursive): {recursive_time * 1000:.2f} ms")
+    print(f"node_index (dict):     {index_time * 1000:.2f} ms")
+    print(f"Speedup: {recursive_time / max(index_time, 1e-9):.0f}x")
+
+
+if __name__ == "__main__":
+    main()
+
+# run "python -m backend.crawler.benchmark_tree"
@@ -0,0 +1,320 @@
+import asyncio
+import itertools
+import os
+import random
+import re
+import string
+import struct
+import sys
+import time
+from backend.config import (
+    SUBDOMAIN_NAMESERVERS,
+    SUBDOMAIN_WORDLIST,
+    DNS_BRUTEFORCE_CONCURRENCY,
+    DNS_BRUTEFORCE_TIMEOUT,
+    DNS_BRUTEFORCE_RETRIES,
+    DNS_BRUTEFORCE_MAX_CANDIDATES,
+    DNS_BRUTEFORCE_DEADLINE,
+)
+
+DEFAULT_WORDLIST = os.path.join(os.path.dirname(__file__), 'wordlist', 'subdomains.txt')
+
+TYPE_A = 1
+TYPE_CNAME = 5
+RCODE_NOERROR = 0
+RCODE_NXDOMAIN = 3
+
+# 이미 알려진 라벨에 붙여 볼 단어 (dev-api, api-dev 형태)
+MUTATION_WORDS = ['dev', 'test', 'stage', 'staging', 'prod', 'api', 'admin', 'old', 'new', 'beta', 'internal', 'v2']
+
+
+def build_query(qid, name, qtype=TYPE_A):
+    qname = b''
+    for label in name.rstrip('.').split('.'):
+        encoded = label.encode('ascii')
+        if not 0 < len(encoded) < 64:
+            raise ValueError(f"Invalid DNS label in {name}")
+        qname += bytes([len(encoded)]) + encoded
+    # 플래그 0x0100: 재귀 질의(RD)
+    header = struct.pack('!HHHHHH', qid, 0x0100, 1, 0, 0, 0)
+    return header + qname + b'\x00' + struct.pack('!HH', qtype, 1)
+
+
+def read_name(data, offset):
+    labels = []
+    end = None
+    for _ in range(128):
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            # 압축 포인터: 처음 만난 포인터 뒤가 이 이름의 끝
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            continue
+        if length == 0:
+            return '.'.join(labels).lower(), end if end is not None else offset + 1
+        labels.append(data[offset + 1:offset + 1 + length].decode('ascii', 'replace'))
+        offset += 1 + length
+    raise ValueError("DNS name compression loop")
+
+
+def parse_response(data):
+    """응답 패킷에서 (id, 질의 이름, rcode, A 레코드 목록, CNAME 목록)을 꺼낸다."""
+    qid, flags, qdcount, ancount, _, _ = struct.unpack('!HHHHHH', data[:12])
+    offset = 12
+    qname = None
+    for _ in range(qdcount):
+        qname, offset = read_name(data, offset)
+        offset += 4
+
+    addresses, cnames = [], []
+    for _ in range(ancount):
+        _, offset = read_name(data, offset)
+        rtype, _, _, rdlength = struct.unpack('!HHIH', data[offset:offset + 10])
+        offset += 10
+        if rtype == TYPE_A and rdlength == 4:
+            addresses.append('.'.join(str(b) for b in data[offset:offset + 4]))
+        elif rtype == TYPE_CNAME:
+            cnames.append(read_name(data, offset)[0])
+        offset += rdlength
+    return qid, qname, flags & 0x000F, addresses, cnames
+
+
+class DNSClientProtocol(asyncio.DatagramProtocol):
+    """소켓 하나로 여러 질의를 동시에 보내고 질의 ID로 응답을 짝지음."""
+
+    def __init__(self):
+        self.transport = None
+        # qid -> (질의 이름, Future)
+        self.pending = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        try:
+            qid, qname, rcode, addresses, cnames = parse_response(data)
+        except Exception:
+            return
+        entry = self.pending.get(qid)
+        # 다른 질의의 늦은 응답이나 위조 응답은 무시
+        if entry is None or entry[0] != qname or entry[1].done():
+            return
+        entry[1].set_result((rcode, addresses, cnames))
+
+    def error_received(self, exc):
+        pass
+
+    def connection_lost(self, exc):
+        for _, future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("DNS socket closed"))
+
+
+class UDPResolver:
+    """
+    UDP로 직접 A 레코드를 조회하는 경량 DNS 클라이언트.
+    운영체제 resolver를 거치지 않아 초당 수천 건의 질의를 보낼 수 있다.
+    """
+
+    def __init__(
+        self,
+        nameservers=SUBDOMAIN_NAMESERVERS,
+        concurrency=DNS_BRUTEFORCE_CONCURRENCY,
+        timeout=DNS_BRUTEFORCE_TIMEOUT,
+        retries=DNS_BRUTEFORCE_RETRIES,
+    ):
+        if isinstance(nameservers, str):
+            nameservers = [ns.strip() for ns in nameservers.split(',') if ns.strip()]
+        # "host" 또는 "host:port"
+        self.nameservers = [self.parse_nameserver(ns) for ns in nameservers]
+        self.next_nameserver = itertools.cycle(self.nameservers)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.timeout = timeout
+        self.retries = retries
+        self.protocol = None
+        self.queries = 0
+
+    @staticmethod
+    def parse_nameserver(nameserver):
+        host, _, port = nameserver.partition(':')
+        return host, int(port or 53)
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        _, self.protocol = await loop.create_datagram_endpoint(DNSClientProtocol, local_addr=('0.0.0.0', 0))
+
+    def close(self):
+        if self.protocol is not None and self.protocol.transport is not None:
+            self.protocol.transport.close()
+        self.protocol = None
+
+    def new_qid(self):
+        while True:
+            qid = random.getrandbits(16)
+            if qid not in self.protocol.pending:
+                return qid
+
+    async def query_once(self, name):
+        qid = self.new_qid()
+        future = asyncio.get_running_loop().create_future()
+        self.protocol.pending[qid] = (name, future)
+        try:
+            self.protocol.transport.sendto(build_query(qid, name), next(self.next_nameserver))
+            self.queries += 1
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self.protocol.pending.pop(qid, None)
+
+    async def query(self, name):
+        """(주소 목록, CNAME 목록)을 반환하고, 이름이 없거나 응답이 없으면 None."""
+        name = name.lower().rstrip('.')
+        async with self.semaphore:
+            for _ in range(self.retries + 1):
+                try:
+                    rcode, addresses, cnames = await self.query_once(name)
+                except asyncio.TimeoutError:
+                    continue
+                except ValueError:
+                    return None
+                if rcode == RCODE_NOERROR:
+                    return (addresses, cnames) if addresses or cnames else None
+                if rcode == RCODE_NXDOMAIN:
+                    return None
+                # SERVFAIL 등은 다른 네임서버로 재시도
+        return None
+
+
+def load_wordlist(path=None):
+    with open(path or SUBDOMAIN_WORDLIST or DEFAULT_WORDLIST, 'r', encoding='utf-8') as file:
+        return [line.strip().lower() for line in file if line.strip() and not line.startswith('#')]
+
+
+def mutate_label(label):
+    # 숫자 증감: dev1 -> dev0, dev2, dev3 / 숫자가 없으면 dev1, dev2, dev-1
+    match = re.match(r'^(.*?)(\d+)$', label)
+    if match:
+        base, number = match.group(1), match.group(2)
+        for value in (int(number) - 1, int(number) + 1, int(number) + 2):
+            if value >= 0:
+                yield f"{base}{str(value).zfill(len(number))}"
+    else:
+        yield f"{label}1"
+        yield f"{label}2"
+        yield f"{label}-1"
+
+    # 대시 조합: api -> api-dev, dev-api / dev-api -> dev, api, api-dev
+    for word in MUTATION_WORDS:
+        if word != label:
+            yield f"{label}-{word}"
+            yield f"{word}-{label}"
+    if '-' in label:
+        parts = label.split('-')
+        yield from parts
+        yield '-'.join(reversed(parts))
+
+
+def generate_candidates(domain, words, known=(), limit=DNS_BRUTEFORCE_MAX_CANDIDATES):
+    """
+    단어 목록 후보를 먼저, 이미 알려진 서브 도메인의 변형을 그 다음에 둔다.
+    스캐너는 "<라벨>.<도메인>" 한 단계 서브 도메인만 사용하므로 후보도 한 단계 이름만 만든다.
+    """
+    known = set(known)
+    candidates = dict.fromkeys(f"{word}.{domain}" for word in words if '.' not in word)
+    suffix = f".{domain}"
+    for subdomain in sorted(known):
+        label = subdomain[:-len(suffix)] if subdomain.endswith(suffix) else ''
+        if not label or '.' in label:
+            continue
+        for mutation in mutate_label(label):
+            if mutation and re.fullmatch(r'[a-z0-9]([a-z0-9-]{0,61}[a-z0-9])?', mutation):
+                candidates[f"{mutation}.{domain}"] = None
+    return [candidate for candidate in candidates if candidate not in known][:limit]
+
+
+class DNSBruteForcer:
+    """
+    단어 목록과 변형 후보를 직접 DNS로 조회해 존재하는 서브 도메인을 찾는다.
+    와일드카드 DNS(*.example.com)가 설정된 영역은 무작위 이름의 응답과 같은 결과를 걸러낸다.
+    """
+
+    name = 'bruteforce'
+    confidence = 0.95
+
+    def __init__(self, domain, resolver=None, wordlist=None, deadline=DNS_BRUTEFORCE_DEADLINE):
+        self.domain = domain
+        self.resolver = resolver or UDPResolver()
+        self.words = wordlist if wordlist is not None else load_wordlist()
+        self.deadline = deadline
+        # 상위 영역 -> 와일드카드 응답 (주소 집합, CNAME 집합) 또는 None
+        self.wildcards = {}
+
+    async def wildcard_answers(self, parent):
+        if parent not in self.wildcards:
+            self.wildcards[parent] = asyncio.ensure_future(self.detect_wildcard(parent))
+        return await asyncio.shield(self.wildcards[parent])
+
+    async def detect_wildcard(self, parent):
+        probes = [
+            ''.join(random.choices(string.ascii_lowercase + string.digits, k=16)) + f".{parent}"
+            for _ in range(3)
+        ]
+        answers = [answer for answer in await asyncio.gather(*(self.resolver.query(p) for p in probes)) if answer]
+        if not answers:
+            return None
+        print(f"Wildcard DNS detected for *.{parent}")
+        return {address for a, _ in answers for address in a}, {cname for _, c in answers for cname in c}
+
+    async def check(self, name):
+        answer = await self.resolver.query(name)
+        if answer is None:
+            return None
+        wildcard = await self.wildcard_answers(name.split('.', 1)[1])
+        if wildcard is not None:
+            addresses, cnames = answer
+            wildcard_addresses, wildcard_cnames = wildcard
+            if (addresses and set(addresses) <= wildcard_addresses) or (cnames and set(cnames) <= wildcard_cnames):
+                return None
+        return name
+
+    async def run(self, known=()):
+        candidates = generate_candidates(self.domain, self.words, known)
+        found = set()
+        started = time.monotonic()
+        await self.resolver.start()
+        try:
+            tasks = [asyncio.ensure_future(self.check(candidate)) for candidate in candidates]
+            for task in asyncio.as_completed(tasks, timeout=self.deadline):
+                try:
+                    name = await task
+                except asyncio.TimeoutError:
+                    print(f"DNS brute-force deadline reached for {self.domain}, returning partial results")
+                    break
+                if name:
+                    found.add(name)
+            for task in tasks:
+                task.cancel()
+        finally:
+            self.resolver.close()
+
+        elapsed = time.monotonic() - started
+        print(
+            f"DNS brute-force for {self.domain}: {len(candidates)} candidates, "
+            f"{self.resolver.queries} queries in {elapsed:.1f}s "
+            f"({self.resolver.queries / max(elapsed, 1e-9):.0f} q/s), {len(found)} found"
+        )
+        return found
+
+
+async def main():
+    domain = sys.argv[1] if len(sys.argv) > 1 else input("Enter the domain to brute-force: ")
+    nameservers = sys.argv[2] if len(sys.argv) > 2 else SUBDOMAIN_NAMESERVERS
+    found = await DNSBruteForcer(domain, UDPResolver(nameservers)).run()
+    for name in sorted(found):
+        print(name)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+
+# run "python -m backend.crawler.bruteforce example.com 127.0.0.1:5353"
@@ -7,12 +7,16 @@ from fastapi import WebSocket, WebSocketDisconnect
 from backend.routes.websocket import ConnectionManager
 import json
 import asyncio
+import uuid
 from backend.crawler.subdomain import SubdomainScanner
 from backend.crawler.get_subdomains_directory import SubdomainDirectoryCrawler
 from backend.crawler.version import AdvancedWebAnalyzer
 from backend.crawler.myparser import Parser
-from backend.database.mongodb import cve_collection
-from typing import Dict, List, Any
+from backend.crawler.scheduler import scheduler, PRIORITY_MAIN_DOMAIN, PRIORITY_SUBDOMAIN
+from backend.crawler.liveness import liveness_prober
+from backend.crawler.cve_index import cve_index, endpoint_tokens
+from backend.config import CRAWLER_MAX_DEPTH
+from typing import Dict, List, Any, Optional
 
 manager = ConnectionManager()
 
@@ -30,51 +34,46 @@ async def send_json(user_id: str, data: dict):
     await manager.send_message(user_id, json.dumps(data))
 
 
-def get_cves(software_info: Dict[str, Any], directory_structure: Dict[str, Any]) -> List[str]:
-    def check_endpoints(details: Dict[str, Any], cve: Dict[str, Any]) -> bool:
-        if details is None:
-            return False
-        if 'input_tags' in details:
-            for tag in details['input_tags']:
-                if tag.get('type') == cve.get('endpoint') or tag.get('id') == cve.get('endpoint'):
-                    return True
-        return False
+class CrawlStream:
+    """스트리밍 모드에서 결과를 완성되는 대로 순번(seq)을 붙여 WebSocket으로 전송한다."""
 
-    def traverse_directory(directory: Dict[str, Any], cve: Dict[str, Any]) -> bool:
-        details = directory.get('details')
-        if details is not None and check_endpoints(details, cve):
-            return True
-        for child in directory.get('children', []):
-            if traverse_directory(child, cve):
-                return True
-        return False
+    def __init__(self, user_id: str, include_pages: bool = False):
+        self.user_id = user_id
+        self.include_pages = include_pages
+        self.seq = 0
+        self.node_count = 0
+
+    async def send(self, frame_type: str, data: Any = None):
+        self.seq += 1
+        await send_json(self.user_id, {"type": frame_type, "seq": self.seq, "data": data})
+
+    async def send_node(self, node: Dict[str, Any], parent: Optional[str] = None):
+        self.node_count += 1
+        await self.send("node", {"parent": parent, **node})
 
-    matching_cves = set()
+    async def send_page(self, subdomain_url: str, url: str, details: Optional[Dict[str, Any]]):
+        if self.include_pages:
+            await self.send("page", {"subdomain": subdomain_url, "url": url, "details": details})
 
+    async def send_complete(self, url: str):
+        await self.send("complete", {"url": url, "nodes": self.node_count})
+
+
+def get_cve_matches(software_info: Dict[str, Any], directory_structure: Dict[str, Any]) -> Dict[str, List[str]]:
+    """CVE 번호 -> 해당 CVE의 endpoint가 발견된 페이지 URL 목록"""
     if directory_structure is None:
-        return list(matching_cves)
-
-    os_value = software_info.get("os", "")
-    technologies = software_info.get("technologies", [])
-    frameworks = software_info.get("frameworks", [])
-
-    print(f"OS: {os_value}")
-    print(f"Technologies: {technologies}")
-    print(f"Frameworks: {frameworks}")
-
-    query = {
-        "$or": [
-            {"os": os_value.lower() if os_value else ""},
-            {"technology": {"$in": [tech.lower() for tech in technologies if tech]}},
-            {"framework": {"$in": [framework.lower() for framework in frameworks if framework]}}
-        ]
-    }
+        return {}
+
+    print(f"OS: {software_info.get('os', '')}")
+    print(f"Technologies: {software_info.get('technologies', [])}")
+    print(f"Frameworks: {software_info.get('frameworks', [])}")
+
+    # 트리를 한 번만 순회해 endpoint 토큰을 만들고, 메모리의 CVE 역색인과 교집합으로 매칭
+    return cve_index.match(software_info, endpoint_tokens(directory_structure))
 
-    for cve in cve_collection.find(query):
-        if traverse_directory(directory_structure, cve):
-            matching_cves.add(cve.get('cve number'))
 
-    return list(matching_cves)
+def get_cves(software_info: Dict[str, Any], directory_structure: Dict[str, Any]) -> List[str]:
+    return sorted(get_cve_matches(software_info, directory_structure))
 
 
 """
@@ -109,9 +108,24 @@ def get_cves(software_info: Dict[str, Any], directory_structure: Dict[str, Any])
 """
 
 
-async def analyze_subdomain(user_id: str, subdomain: str):
+def page_callback(stream: Optional[CrawlStream], start_url: str):
+    if stream is None or not stream.include_pages:
+        return None
+
+    async def on_page(url: str, details: Optional[Dict[str, Any]]):
+        await stream.send_page(start_url, url, details)
+
+    return on_page
+
+
+async def analyze_subdomain(
+    user_id: str, subdomain: str, stream: Optional[CrawlStream] = None, url: Optional[str] = None
+):
     if not await check_connection(user_id):
         return None
+
+    # liveness 단계에서 확인된 스킴이 있으면 사용 (기본값 https)
+    url = url or f"https://{subdomain}"
     
     await send_status(user_id, f"Starting Analyzing for {subdomain}")
 
@@ -122,8 +136,8 @@ async def analyze_subdomain(user_id: str, subdomain: str):
         return None
 
     # 디렉토리 구조 크롤링과 소프트웨어 분석을 동시에 수행
-    directory_crawler = SubdomainDirectoryCrawler(f"https://{subdomain}", max_depth=2)
-    analyzer = AdvancedWebAnalyzer(f"https://{subdomain}")
+    directory_crawler = SubdomainDirectoryCrawler(url, max_depth=CRAWLER_MAX_DEPTH, on_page=page_callback(stream, url))
+    analyzer = AdvancedWebAnalyzer(url)
 
     directory_task = asyncio.create_task(directory_crawler.run())
     analyzer_task = asyncio.create_task(analyzer.analyze())
@@ -144,10 +158,10 @@ async def analyze_subdomain(user_id: str, subdomain: str):
             directory_task, analyzer_task
         )
 
-        cves = get_cves(software_info, directory_structure)
+        cve_pages = get_cve_matches(software_info, directory_structure)
 
-        # 결과 조합
-        subdomain_result = {"url": f"https://{subdomain}", "cve": cves, "children": []}
+        # 결과 조합 (cve_pages: CVE별로 매칭된 endpoint가 있는 페이지)
+        subdomain_result = {"url": url, "cve": sorted(cve_pages), "cve_pages": cve_pages, "children": []}
 
         await send_status(
             user_id, f"Completed analysis of the subdomain list for {subdomain}"
@@ -159,7 +173,87 @@ async def analyze_subdomain(user_id: str, subdomain: str):
         return None
 
 
-async def crawl_url(url: str, user_id: str):
+async def analyze_main_domain(url: str, stream: Optional[CrawlStream] = None):
+    main_analyzer = AdvancedWebAnalyzer(url)
+    main_directory_crawler = SubdomainDirectoryCrawler(
+        url, max_depth=CRAWLER_MAX_DEPTH, on_page=page_callback(stream, url)
+    )
+
+    # Todo. add cancel function in main_analyzer
+    main_software_info, main_directory_structure = await asyncio.gather(
+        main_analyzer.analyze(), main_directory_crawler.run()
+    )
+    cve_pages = get_cve_matches(main_software_info, main_directory_structure)
+    return {"url": url, "cve": sorted(cve_pages), "cve_pages": cve_pages, "children": []}
+
+
+def schedule_main_domain(scan_id: str, user_id: str, url: str, stream: Optional[CrawlStream] = None):
+    return scheduler.run(
+        lambda: analyze_main_domain(url, stream), user_id, scan_id, priority=(PRIORITY_MAIN_DOMAIN, 0.0)
+    )
+
+
+def schedule_subdomain(
+    scan_id: str,
+    user_id: str,
+    subdomain: str,
+    confidence: float,
+    stream: Optional[CrawlStream] = None,
+    url: Optional[str] = None,
+):
+    # 메인 도메인 다음으로, 신뢰도가 높은 출처에서 발견된 서브 도메인부터 실행
+    return scheduler.run(
+        lambda: analyze_subdomain(user_id, subdomain, stream, url),
+        user_id,
+        scan_id,
+        priority=(PRIORITY_SUBDOMAIN, -confidence),
+    )
+
+
+async def send_queue_status(user_id: str, scan_id: str):
+    stats = scheduler.stats()
+    queued = stats["queued_by_scan"].get(scan_id, 0)
+    running = stats["in_flight_by_scan"].get(scan_id, 0)
+    await send_status(
+        user_id, f"Scheduled analysis: {running} running, {queued} queued ({stats['in_flight']} running in total)"
+    )
+
+
+async def stream_crawl(
+    url: str,
+    user_id: str,
+    scan_id: str,
+    subdomain_scanner: SubdomainScanner,
+    sub_urls: List[str],
+    stream: CrawlStream,
+    targets: Dict[str, str],
+):
+    # 메인 도메인과 서브 도메인 결과를 완료되는 즉시 전송하고 메모리에 보관하지 않음
+    async def run_main():
+        main_result = await schedule_main_domain(scan_id, user_id, url, stream)
+        if await check_connection(user_id):
+            await stream.send_node(main_result)
+
+    async def run_subdomain(subdomain: str):
+        subdomain_result = await schedule_subdomain(
+            scan_id, user_id, subdomain, subdomain_scanner.confidence(subdomain), stream, targets.get(subdomain)
+        )
+        if subdomain_result is not None:
+            await stream.send_node(subdomain_result, parent=url)
+
+    tasks = [asyncio.create_task(run_main())]
+    tasks += [asyncio.create_task(run_subdomain(subdomain)) for subdomain in sub_urls]
+    await send_queue_status(user_id, scan_id)
+    await asyncio.gather(*tasks)
+
+    if not await check_connection(user_id):
+        return None
+
+    await send_status(user_id, f"Full crawling completed")
+    await stream.send_complete(url)
+
+
+async def crawl_url(url: str, user_id: str, stream: bool = False, stream_pages: bool = False):
     if not await check_connection(user_id):
         return None
     
@@ -171,35 +265,53 @@ async def crawl_url(url: str, user_id: str):
     
     if not await check_connection(user_id):
         return None
-    
-    main_analyzer = AdvancedWebAnalyzer(url)
-    main_directory_crawler = SubdomainDirectoryCrawler(url, max_depth=2)
 
-    if not await check_connection(user_id):
-        return None
+    # 응답하지 않는 호스트와 같은 내용을 제공하는 호스트를 깊은 분석 전에 제외
+    # (신뢰도가 높은 서브 도메인이 대표로 남도록 신뢰도 순으로 정렬)
+    candidates = sorted(sub_urls, key=lambda subdomain: -subdomain_scanner.confidence(subdomain))
+    live, collapsed, dead = await liveness_prober.filter_live(candidates, main_url=url)
+    sub_urls = [result["host"] for result in live]
+    targets = {result["host"]: result["url"] for result in live}
+    await send_status(
+        user_id,
+        f"{len(sub_urls)} of {len(candidates)} subdomains are live and unique "
+        f"({len(dead)} unreachable, {sum(map(len, collapsed.values()))} duplicates skipped)",
+    )
+
+    scan_id = uuid.uuid4().hex
+
+    if stream:
+        return await stream_crawl(
+            url,
+            user_id,
+            scan_id,
+            subdomain_scanner,
+            sub_urls,
+            CrawlStream(user_id, include_pages=stream_pages),
+            targets,
+        )
     
-    # Todo. add cancel function in main_analyzer
-    main_analyzer_task = asyncio.create_task(main_analyzer.analyze())
-    main_directory_task = asyncio.create_task(main_directory_crawler.run())
-    subdomain_tasks = [analyze_subdomain(user_id, subdomain) for subdomain in sub_urls]
+    main_task = asyncio.create_task(schedule_main_domain(scan_id, user_id, url))
+    subdomain_tasks = [
+        asyncio.create_task(
+            schedule_subdomain(
+                scan_id, user_id, subdomain, subdomain_scanner.confidence(subdomain), url=targets.get(subdomain)
+            )
+        )
+        for subdomain in sub_urls
+    ]
+    await send_queue_status(user_id, scan_id)
 
     if not await check_connection(user_id):
         return None
     
-    all_results = await asyncio.gather(main_analyzer_task, main_directory_task, *subdomain_tasks)
+    all_results = await asyncio.gather(main_task, *subdomain_tasks)
 
-    main_software_info = all_results[0]
-    main_directory_structure = all_results[1]
-    subdomain_results = all_results[2:]
+    result = all_results[0]
+    result["children"] = all_results[1:]
 
     if not await check_connection(user_id):
         return None
-    
-    result = {
-        "url": url,
-        "cve": get_cves(main_software_info, main_directory_structure),
-        "children": subdomain_results
-    }
 
     await send_status(user_id, f"Full crawling completed")
     await send_json(user_id, result)
\ No newline at end of file
@@ -0,0 +1,377 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import re
+import time
+from backend.config import CVE_INDEX_REFRESH_SECONDS
+from backend.database.mongodb import cve_collection, meta_collection
+
+logger = logging.getLogger(__name__)
+
+# meta 컬렉션에서 CVE 데이터 버전을 담는 문서 (backend/core/cve.py가 데이터를 다시 넣을 때 증가)
+CVE_META_ID = "cve"
+
+INDEXED_FIELDS = ("os", "technology", "framework", "endpoint")
+
+# CVE마다 보고하는 근거 페이지 수
+MAX_EVIDENCE_PAGES = 20
+
+# 분석기가 찾은 이름과 CVE 데이터의 제품 이름이 다른 경우 (소문자 기준)
+PRODUCT_ALIASES = {
+    "nodejs": "node.js",
+    "node": "node.js",
+    "express.js": "express",
+    "expressjs": "express",
+    "ruby on rails": "rails",
+    "spring framework": "spring",
+    "vue": "vue.js",
+    "vuejs": "vue.js",
+    "angular.js": "angularjs",
+    "moment": "moment.js",
+    "joomla!": "joomla",
+    "microsoft-iis": "iis",
+    "microsoft iis": "iis",
+    "apache httpd": "apache",
+    "apache http server": "apache",
+    "wp": "wordpress",
+}
+
+# 버전 키: (숫자 4자리, 단계, 단계 번호). 단계는 정식 릴리스보다 pre-release가 앞에 오도록 정렬
+PRE_RELEASE_STAGES = {"dev": 0, "a": 1, "alpha": 1, "b": 2, "beta": 2, "pre": 3, "preview": 3, "c": 3, "rc": 3}
+RELEASE = 4
+# last_affected처럼 경계 버전을 포함해야 할 때 쓰는 "바로 다음" 단계
+AFTER_RELEASE = 5
+
+VERSION_PATTERN = re.compile(r'v?(\d+(?:\.\d+){0,3})(.*)', re.IGNORECASE)
+PRE_RELEASE_PATTERN = re.compile(r'[-_.~]?(dev|alpha|beta|preview|pre|rc|a|b|c)\.?(\d*)(?![a-z])', re.IGNORECASE)
+# "PHP/8.1.2", "jQuery 3.5.1", "nginx/1.18.0 (Ubuntu)" -> 이름과 버전
+SOFTWARE_PATTERN = re.compile(r'^(.*?)[\s/]+v?(\d+(?:\.\d+)*\S*)')
+
+
+def parse_version(text):
+    """"3.5.1", "5.0.0-rc1", "8.1.2-1ubuntu2" -> 비교 가능한 고정 길이 튜플, 숫자로 시작하지 않으면 None."""
+    if not isinstance(text, str):
+        return None
+    match = VERSION_PATTERN.match(text.strip())
+    if match is None:
+        return None
+    numbers = [int(part) for part in match.group(1).split('.')]
+    numbers += [0] * (4 - len(numbers))
+    stage, stage_number = RELEASE, 0
+    # 배포판 패치 번호(-1ubuntu2) 등 알 수 없는 접미사는 정식 릴리스로 취급
+    pre_release = PRE_RELEASE_PATTERN.match(match.group(2))
+    if pre_release:
+        stage = PRE_RELEASE_STAGES[pre_release.group(1).lower()]
+        stage_number = int(pre_release.group(2) or 0)
+    return (*numbers, stage, stage_number)
+
+
+def version_after(version):
+    # 포함 상한(last_affected)을 반열린 구간의 상한으로 바꿈
+    if version[4] == RELEASE:
+        return (*version[:4], AFTER_RELEASE, 0)
+    return (*version[:5], version[5] + 1)
+
+
+def normalize_product(name):
+    """"jQuery", "Ruby on Rails", "Bootstrap (probable)" -> 비교용 제품 이름."""
+    if not isinstance(name, str):
+        return ""
+    name = re.sub(r'\(.*?\)', '', name).strip().lower()
+    return PRODUCT_ALIASES.get(name, name)
+
+
+def parse_software(value):
+    """분석기가 찾은 문자열 하나를 (제품 이름, 버전 키 또는 None) 목록으로 나눈다. "PHP/8.1.2, ASP.NET" 처럼 여러 개일 수 있다."""
+    found = []
+    for part in value.split(','):
+        part = part.strip()
+        match = SOFTWARE_PATTERN.match(part)
+        if match and match.group(1):
+            name, version = normalize_product(match.group(1)), parse_version(match.group(2))
+        else:
+            name, version = normalize_product(part), None
+        if name:
+            found.append((name, version))
+    return found
+
+
+def detected_software(software_info):
+    """분석 결과의 기술, 프레임워크, 서버 정보를 (제품 이름, 버전 키) 목록으로 모은다."""
+    values = list(software_info.get("technologies") or []) + list(software_info.get("frameworks") or [])
+    server = software_info.get("server") or {}
+    if server.get("type"):
+        values.append(f"{server['type']} {server.get('version', '')}".strip())
+    elif server.get("name"):
+        values.append(server["name"])
+
+    found = []
+    for value in values:
+        if isinstance(value, str):
+            found.extend(parse_software(value))
+    return found
+
+
+class VersionRangeIndex:
+    """
+    제품 하나의 영향 버전 구간 색인.
+    모든 구간 경계를 정렬해 두고 경계 사이 구간마다 해당하는 CVE 위치 집합을 미리 만들어,
+    버전 하나는 bisect 한 번으로 조회한다.
+    """
+
+    def __init__(self):
+        self.ranges = []
+        self.boundaries = []
+        self.segments = []
+        # 버전을 모를 때 이름만으로 매칭할 CVE
+        self.positions = set()
+
+    def add(self, position, start, end):
+        """start 이상 end 미만 (None이면 제한 없음)"""
+        self.ranges.append((position, start, end))
+        self.positions.add(position)
+
+    def build(self):
+        self.boundaries = sorted({bound for _, start, end in self.ranges for bound in (start, end) if bound is not None})
+        # segments[i]: boundaries[i - 1] 이상 boundaries[i] 미만
+        self.segments = [set() for _ in range(len(self.boundaries) + 1)]
+        for position, start, end in self.ranges:
+            first = bisect.bisect_left(self.boundaries, start) + 1 if start is not None else 0
+            last = bisect.bisect_left(self.boundaries, end) if end is not None else len(self.boundaries)
+            for segment in self.segments[first:last + 1]:
+                segment.add(position)
+        return self
+
+    def lookup(self, version):
+        return self.segments[bisect.bisect_right(self.boundaries, version)]
+
+
+class CVEIndexData:
+    """CVE 목록 한 벌과 필드 값 -> CVE 위치 집합의 역색인. 만든 뒤에는 바꾸지 않고 통째로 교체한다."""
+
+    def __init__(self, documents=(), version=0):
+        self.version = version
+        self.records = []
+        self.indexes = {field: {} for field in INDEXED_FIELDS}
+        # 정규화한 제품 이름 -> affected 구간이 없는 CVE 위치 (이름만으로 매칭)
+        self.products = {}
+        # 정규화한 제품 이름 -> VersionRangeIndex
+        self.version_ranges = {}
+        # affected 구간이 있는 CVE는 버전 구간으로만 매칭
+        self.ranged = set()
+        for document in documents:
+            self.add(document)
+        for ranges in self.version_ranges.values():
+            ranges.build()
+
+    def add(self, document):
+        position = len(self.records)
+        self.records.append({
+            "cve number": document.get("cve number"),
+            "endpoint": document.get("endpoint"),
+        })
+        for field in INDEXED_FIELDS:
+            value = document.get(field)
+            # MongoDB 동등 비교와 같게 문자열 값 그대로 색인 (배열이면 원소마다 색인)
+            values = value if isinstance(value, list) else [value]
+            for item in values:
+                if isinstance(item, str):
+                    self.indexes[field].setdefault(item, set()).add(position)
+
+        if self.add_ranges(position, document.get("affected")):
+            self.ranged.add(position)
+            return
+        for field in ("technology", "framework"):
+            product = normalize_product(document.get(field))
+            if product:
+                self.products.setdefault(product, set()).add(position)
+
+    def add_ranges(self, position, affected):
+        """affected: [{"product", "introduced", "fixed" 또는 "last_affected"}], 올바른 구간이 하나라도 있으면 True"""
+        added = False
+        for entry in affected if isinstance(affected, list) else ():
+            if not isinstance(entry, dict):
+                continue
+            product = normalize_product(entry.get("product"))
+            if not product:
+                continue
+            start = parse_version(entry.get("introduced"))
+            if entry.get("fixed") is not None:
+                end = parse_version(entry["fixed"])
+            elif entry.get("last_affected") is not None:
+                end = parse_version(entry["last_affected"])
+                end = version_after(end) if end is not None else None
+            else:
+                end = None
+            # 버전을 읽을 수 없는 구간은 너무 넓게 매칭되지 않도록 버림
+            if end is None and (entry.get("fixed") or entry.get("last_affected")):
+                continue
+            self.version_ranges.setdefault(product, VersionRangeIndex()).add(position, start, end)
+            added = True
+        return added
+
+    def lookup(self, field, values):
+        index = self.indexes[field]
+        found = set()
+        for value in values:
+            found |= index.get(value, set())
+        return found
+
+
+class CVEIndex:
+    """
+    CVE 컬렉션을 시작할 때 한 번 메모리에 올리고, 스캔 중에는 DB 조회 없이 집합 연산으로 매칭한다.
+    meta 컬렉션의 버전이 바뀌면 백그라운드에서 다시 읽어 교체한다.
+    """
+
+    def __init__(self, collection=cve_collection, meta=meta_collection, refresh_seconds=CVE_INDEX_REFRESH_SECONDS):
+        self.collection = collection
+        self.meta = meta
+        self.refresh_seconds = refresh_seconds
+        self.data = None
+        self.refresh_task = None
+
+    def current_version(self):
+        document = self.meta.find_one({"_id": CVE_META_ID})
+        return document.get("version", 0) if document else 0
+
+    def load_sync(self):
+        started = time.perf_counter()
+        version = self.current_version()
+        data = CVEIndexData(self.collection.find({}, {"_id": 0}), version)
+        self.data = data
+        logger.info(
+            f"CVE index loaded: {len(data.records)} entries, version {version} "
+            f"({(time.perf_counter() - started) * 1000:.0f} ms)"
+        )
+        return data
+
+    async def load(self):
+        try:
+            await asyncio.to_thread(self.load_sync)
+        except Exception as e:
+            logger.error(f"Error loading CVE index: {e}")
+
+    async def refresh_if_changed(self):
+        try:
+            version = await asyncio.to_thread(self.current_version)
+        except Exception as e:
+            logger.error(f"Error checking CVE data version: {e}")
+            return
+        if self.data is None or version != self.data.version:
+            await self.load()
+
+    async def refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            await self.refresh_if_changed()
+
+    async def start(self):
+        await self.load()
+        if self.refresh_task is None and self.refresh_seconds > 0:
+            self.refresh_task = asyncio.create_task(self.refresh_loop())
+
+    async def close(self):
+        if self.refresh_task is not None:
+            self.refresh_task.cancel()
+            try:
+                await self.refresh_task
+            except asyncio.CancelledError:
+                pass
+            self.refresh_task = None
+
+    def candidates(self, data, software_info):
+        """
+        affected 구간이 없는 CVE는 기존 $or 조건(os / technology / framework 일치)에 정규화한 제품 이름 일치를 더해 고르고,
+        구간이 있는 CVE는 찾은 버전이 구간 안에 있을 때만 고른다 (그 제품의 버전을 하나도 모르면 제품 이름만으로 매칭).
+        """
+        os_value = software_info.get("os", "")
+        technologies = software_info.get("technologies", [])
+        frameworks = software_info.get("frameworks", [])
+        found = (
+            data.lookup("os", [os_value.lower() if os_value else ""])
+            | data.lookup("technology", [tech.lower() for tech in technologies if tech])
+            | data.lookup("framework", [framework.lower() for framework in frameworks if framework])
+        ) - data.ranged
+
+        # 분석기는 같은 제품을 "jQuery"와 "jQuery 3.5.1"처럼 버전 없이/있이 함께 내보내므로 제품별로 모아서,
+        # 버전이 하나도 없는 제품만 이름으로 매칭
+        versions = {}
+        for product, version in detected_software(software_info):
+            product_versions = versions.setdefault(product, set())
+            if version is not None:
+                product_versions.add(version)
+
+        for product, product_versions in versions.items():
+            found |= data.products.get(product, set())
+            ranges = data.version_ranges.get(product)
+            if ranges is None:
+                continue
+            if not product_versions:
+                found |= ranges.positions
+            for version in product_versions:
+                found |= ranges.lookup(version)
+        return found
+
+    def match(self, software_info, endpoints, max_pages=MAX_EVIDENCE_PAGES):
+        """
+        소프트웨어 정보로 후보 CVE를 고르고, endpoint 토큰과 교집합을 구해
+        CVE 번호 -> 그 CVE의 endpoint가 나온 페이지 URL 목록을 반환한다.
+        endpoints는 endpoint_tokens()의 결과 ((type|id, 값) -> 페이지 URL 집합).
+        """
+        # 스캔 중에는 DB를 조회하지 않음: 아직 색인이 없으면(시작 시 로드 실패 등) refresh_loop가 채울 때까지 빈 결과
+        # (애플리케이션 밖에서 쓸 때는 먼저 load_sync()를 호출)
+        data = self.data
+        if data is None:
+            logger.warning("CVE index is not loaded yet, skipping CVE matching")
+            return {}
+        candidates = self.candidates(data, software_info)
+        endpoint_index = data.indexes["endpoint"]
+
+        # CVE 번호 -> 매칭된 토큰 목록 (페이지 집합은 토큰마다 한 번만 정렬)
+        matched_tokens = {}
+        for token in endpoints:
+            for position in endpoint_index.get(token[1], set()) & candidates:
+                matched_tokens.setdefault(data.records[position]["cve number"], []).append(token)
+
+        sorted_pages = {}
+        matches = {}
+        for cve, tokens in matched_tokens.items():
+            for token in tokens:
+                if token not in sorted_pages:
+                    sorted_pages[token] = sorted(endpoints[token])
+            # 같은 템플릿 페이지가 많으면 결과가 커지므로 CVE마다 max_pages개까지만 보고
+            pages = []
+            for page in heapq.merge(*(sorted_pages[token] for token in tokens)):
+                if not pages or pages[-1] != page:
+                    pages.append(page)
+                    if len(pages) >= max_pages:
+                        break
+            matches[cve] = pages
+        return matches
+
+
+def endpoint_tokens(directory_structure):
+    """
+    크롤링 트리를 한 번 순회해 입력 태그의 (type, 값), (id, 값) 토큰과 토큰이 나온 페이지를 모은다.
+    CVE의 endpoint는 입력 태그의 type이나 id와 같으면 매칭된다.
+    """
+    tokens = {}
+    if directory_structure is None:
+        return tokens
+    stack = [directory_structure]
+    while stack:
+        node = stack.pop()
+        details = node.get("details")
+        if details is not None:
+            for tag in details.get("input_tags", ()):
+                for kind in ("type", "id"):
+                    value = tag.get(kind)
+                    if isinstance(value, str):
+                        tokens.setdefault((kind, value), set()).add(node.get("url"))
+        stack.extend(node.get("children", ()))
+    return tokens
+
+
+cve_index = CVEIndex()
@@ -0,0 +1,124 @@
+import hashlib
+import re
+from urllib.parse import urlparse, parse_qsl
+
+SIMHASH_BITS = 64
+# 구조 특징을 몇 개씩 이어서 하나의 특징으로 볼지 (순서 반영)
+SHINGLE_SIZE = 3
+
+# URL 경로 조각 중 값만 바뀌는 부분 (숫자, 날짜, 16진수/UUID 형태의 ID)
+NUMBER_SEGMENT = re.compile(r'^\d+$')
+ID_SEGMENT = re.compile(r'^(?=.*\d)[0-9a-fA-F-]{8,}$')
+SLUG_NUMBER = re.compile(r'\d+')
+
+
+def feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(features):
+    """특징 문자열 목록의 64비트 SimHash. 같은 특징이 여러 번 나오면 그만큼 가중치가 커진다."""
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        value = feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def shingles(sequence, size=SHINGLE_SIZE):
+    # 연속한 size개의 특징을 이어 붙인 목록 (순서와 반복 횟수가 모두 반영됨)
+    sequence = list(sequence)
+    if len(sequence) <= size:
+        return ['\n'.join(sequence)] if sequence else []
+    return ['\n'.join(sequence[i:i + size]) for i in range(len(sequence) - size + 1)]
+
+
+def structure_fingerprint(structure):
+    """ParsedDocument.structure(문서 순서대로의 태그 경로 목록)의 SimHash."""
+    return simhash(shingles(structure))
+
+
+def hamming_distance(a, b):
+    return (a ^ b).bit_count()
+
+
+def url_pattern(url):
+    """
+    값만 다른 URL을 하나의 패턴으로 묶는다.
+    /news/2024/05/01?page=3&id=7 -> /news/{n}/{n}/{n}?id=*&page=*
+    /item/3f2a9c1e-...          -> /item/{id}
+    /post-123                   -> /post-{n}
+    """
+    parsed = urlparse(url)
+    segments = []
+    for segment in parsed.path.split('/'):
+        if NUMBER_SEGMENT.match(segment):
+            segments.append('{n}')
+        elif ID_SEGMENT.match(segment):
+            segments.append('{id}')
+        else:
+            segments.append(SLUG_NUMBER.sub('{n}', segment))
+    query = '&'.join(sorted({f"{name}=*" for name, _ in parse_qsl(parsed.query, keep_blank_values=True)}))
+    return f"{parsed.netloc}{'/'.join(segments)}" + (f"?{query}" if query else '')
+
+
+class ClusterIndex:
+    """
+    URL 패턴과 페이지 구조(SimHash)로 비슷한 페이지를 묶는다.
+    클러스터마다 samples개까지만 탐색하고, 그 이후의 페이지는 대표 노드의 "represents" 값으로만 센다.
+    """
+
+    def __init__(self, samples, max_distance):
+        self.samples = samples
+        self.max_distance = max_distance
+        # URL 패턴 -> [대표 노드, 탐색한 URL 수]
+        self.patterns = {}
+        # [SimHash, 대표 노드, 탐색한 페이지 수]
+        self.structures = []
+        # 이미 다른 페이지로 대표된 URL (같은 링크를 여러 번 세지 않도록)
+        self.pruned = set()
+
+    @property
+    def enabled(self):
+        return self.samples > 0
+
+    @staticmethod
+    def represent(node):
+        node["represents"] = node.get("represents", 1) + 1
+
+    def admit_link(self, url, node_factory):
+        """링크를 탐색할지 결정한다. 탐색하면 새 노드를, 패턴이 이미 충분히 탐색됐으면 None을 반환."""
+        if url in self.pruned:
+            return None
+        if not self.enabled:
+            return node_factory()
+
+        pattern = url_pattern(url)
+        cluster = self.patterns.get(pattern)
+        if cluster is not None and cluster[1] >= self.samples:
+            self.pruned.add(url)
+            self.represent(cluster[0])
+            return None
+
+        node = node_factory()
+        if cluster is None:
+            self.patterns[pattern] = [node, 1]
+        else:
+            cluster[1] += 1
+        return node
+
+    def admit_page(self, node, fingerprint):
+        """가져온 페이지의 링크를 더 탐색할지 결정한다 (구조가 같은 페이지가 이미 samples개 이상이면 False)."""
+        if not self.enabled or fingerprint is None:
+            return True
+        for cluster in self.structures:
+            if hamming_distance(cluster[0], fingerprint) <= self.max_distance:
+                if cluster[2] >= self.samples:
+                    self.represent(cluster[1])
+                    node["duplicate_of"] = cluster[1]["url"]
+                    return False
+                cluster[2] += 1
+                return True
+        self.structures.append([fingerprint, node, 1])
+        return True
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from backend.config import SUBDOMAIN_CACHE_TTL_SECONDS, SUBDOMAIN_CACHE_MONGODB
+from backend.database.mongodb import subdomain_cache_collection
+from backend.database.indexes import create_indexes
+
+logger = logging.getLogger(__name__)
+
+
+class DiscoveryCache:
+    """
+    등록 도메인별 서브 도메인 수집 결과를 출처(source)마다 따로 저장한다.
+    문서 형태: {"_id": "<domain>|<source>", "domain", "source", "subdomains", "fetched_at"}
+    출처별로 저장하므로 한 출처가 실패해도 다른 출처에서 알려진 서브 도메인은 유지된다.
+    """
+
+    def __init__(self, collection=None, ttl_seconds=SUBDOMAIN_CACHE_TTL_SECONDS):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.index_ready = False
+
+    def ensure_index(self):
+        if not self.index_ready:
+            create_indexes(self.collection, "subdomain_cache")
+            self.index_ready = True
+
+    def load_sync(self, domain):
+        self.ensure_index()
+        entries = {}
+        for document in self.collection.find({"domain": domain}):
+            entries[document["source"]] = {
+                "subdomains": document.get("subdomains", []),
+                "fetched_at": document["fetched_at"].replace(tzinfo=timezone.utc).timestamp(),
+            }
+        return entries
+
+    def save_sync(self, domain, source, subdomains):
+        self.ensure_index()
+        self.collection.replace_one(
+            {"_id": f"{domain}|{source}"},
+            {
+                "domain": domain,
+                "source": source,
+                "subdomains": sorted(subdomains),
+                "fetched_at": datetime.now(timezone.utc),
+            },
+            upsert=True,
+        )
+
+    async def load(self, domain):
+        if self.collection is None:
+            return {}
+        try:
+            return await asyncio.to_thread(self.load_sync, domain)
+        except Exception as e:
+            logger.error(f"Error reading subdomain cache for {domain}: {e}")
+            return {}
+
+    async def save(self, domain, source, subdomains):
+        if self.collection is None:
+            return
+        try:
+            await asyncio.to_thread(self.save_sync, domain, source, subdomains)
+        except Exception as e:
+            logger.error(f"Error writing subdomain cache for {domain} ({source}): {e}")
+
+    def is_fresh(self, entry):
+        return entry["fetched_at"] + self.ttl_seconds > time.time()
+
+
+discovery_cache = DiscoveryCache(
+    collection=subdomain_cache_collection if SUBDOMAIN_CACHE_MONGODB == "true" else None
+)
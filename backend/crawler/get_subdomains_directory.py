@@ -3,82 +3,333 @@ import aiohttp
 from urllib.parse import urljoin, urlparse
 import json
 import logging
+import time
+from collections import deque
 from backend.crawler.myparser import Parser
+from backend.crawler.http_client import http_client
+from backend.crawler.urlnorm import canonicalize_url
+from backend.crawler.dedup import ClusterIndex, structure_fingerprint
+from backend.crawler.site_files import site_files, parse_robots, parse_sitemap
+from backend.config import (
+    CRAWLER_MAX_WORKERS,
+    CRAWLER_MAX_PER_HOST,
+    CRAWLER_MAX_PAGES,
+    CRAWLER_MAX_BYTES,
+    CRAWLER_MAX_SECONDS,
+    CRAWLER_MAX_SITEMAPS,
+    CRAWLER_MAX_PAGE_BYTES,
+    CRAWLER_CLUSTER_SAMPLES,
+    CRAWLER_SIMHASH_DISTANCE,
+    ANALYZER_REQUEST_TIMEOUT,
+)
 
 logging.basicConfig(level=logging.INFO)
 
+# 파싱할 응답의 Content-Type (헤더가 없으면 HTML로 간주)
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
 class SubdomainDirectoryCrawler:
-    def __init__(self, start_url, max_depth=0):
+    def __init__(
+        self,
+        start_url,
+        max_depth=0,
+        max_workers=CRAWLER_MAX_WORKERS,
+        max_per_host=CRAWLER_MAX_PER_HOST,
+        max_pages=CRAWLER_MAX_PAGES,
+        on_page=None,
+        max_bytes=CRAWLER_MAX_BYTES,
+        max_seconds=CRAWLER_MAX_SECONDS,
+        seed_from_site_files=True,
+        max_page_bytes=CRAWLER_MAX_PAGE_BYTES,
+        cluster_samples=CRAWLER_CLUSTER_SAMPLES,
+        simhash_distance=CRAWLER_SIMHASH_DISTANCE,
+    ):
         self.start_url = start_url
-        self.base_domain = urlparse(start_url).netloc
+        self.base_domain = urlparse(canonicalize_url(start_url)).netloc
         self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        # 크롤링 한 번의 예산: 페이지 수, 받은 바이트 수, 경과 시간 (0이면 제한 없음)
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        # robots.txt / sitemap.xml에 적힌 URL을 첫 단계 탐색 대상에 추가
+        self.seed_from_site_files = seed_from_site_files
+        self.bytes_fetched = 0
+        self.deadline_at = None
+        # 페이지 하나의 최대 크기와 페이지별 통계 (URL -> bytes, decode_ms, parse_ms, skipped)
+        self.max_page_bytes = max_page_bytes
+        self.page_stats = {}
+        # 템플릿이 같은 페이지(?page=N, 날짜/상품 ID URL 등)는 클러스터마다 일부만 탐색
+        self.cluster_samples = cluster_samples
+        self.simhash_distance = simhash_distance
+        self.clusters = ClusterIndex(cluster_samples, simhash_distance)
+        # URL -> 페이지 구조 SimHash
+        self.fingerprints = {}
+        # 페이지 분석이 끝날 때마다 호출되는 콜백 (async def on_page(url, details))
+        self.on_page = on_page
+        self.host_semaphores = {}
+        # URL -> 트리 노드 (자식 노드를 추가할 때 함께 등록)
+        self.node_index = {}
+
+    async def read_body(self, response, stats):
+        """
+        HTML 응답만 최대 max_page_bytes까지 조각 단위로 읽는다.
+        HTML이 아니거나 크기를 넘으면 None을 반환하고 이유를 stats에 남긴다.
+        """
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and response.content_type not in HTML_CONTENT_TYPES:
+            stats['skipped'] = f"content type {response.content_type}"
+            return None
+
+        # Content-Length가 있으면 본문을 받기 전에 판단
+        if self.max_page_bytes > 0 and (response.content_length or 0) > self.max_page_bytes:
+            stats['skipped'] = f"content length {response.content_length}"
+            return None
+
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            size += len(chunk)
+            self.bytes_fetched += len(chunk)
+            if self.max_page_bytes > 0 and size > self.max_page_bytes:
+                # 남은 본문은 받지 않고 연결을 닫음
+                response.close()
+                stats['bytes'] = size
+                stats['skipped'] = f"body larger than {self.max_page_bytes} bytes"
+                return None
+            chunks.append(chunk)
+        stats['bytes'] = size
+        return b''.join(chunks)
 
     async def extract_links_and_parse(self, url, session):
+        stats = {'bytes': 0}
+        self.page_stats[url] = stats
         try:
             async with session.get(url) as response:
-                if response.status == 200:
-                    html_content = await response.text()
-                    soup = Parser.get_soup(html_content)
-                    links = set()
-
-                    # get href tag
-                    for link in soup.find_all('a', href=True):
-                        absolute_url = urljoin(url, link.get('href'))
-                        if urlparse(absolute_url).netloc == self.base_domain:
-                            links.add(absolute_url)
-
-                    page_data = await Parser.extract_page_data(url, html_content, response)
-                    return list(links), page_data
-                else:
+                if response.status != 200:
                     logging.warning(f"ERROR: status code {response.status}")
                     return [], None
+
+                body = await self.read_body(response, stats)
+                if body is None:
+                    logging.info(f"skipped {url}: {stats['skipped']}")
+                    return [], None
+
+                started = time.perf_counter()
+                html_content = Parser.decode(body, response.charset)
+                stats['decode_ms'] = (time.perf_counter() - started) * 1000
+
+                started = time.perf_counter()
+                document = Parser.parse(html_content)
+                stats['parse_ms'] = (time.perf_counter() - started) * 1000
+                if self.clusters.enabled:
+                    self.fingerprints[url] = structure_fingerprint(document.structure)
+
+                links = set()
+
+                # get href tag
+                for href in document.links:
+                    absolute_url = self.canonical_link(url, href)
+                    if absolute_url:
+                        links.add(absolute_url)
+
+                page_data = await Parser.extract_page_data(url, document, response)
+                return list(links), page_data
         except Exception as e:
             logging.error(f"ERROR: {e}")
             return [], None
 
-    async def crawl_bfs(self, session):
+    def stats_summary(self):
+        parsed = [stats for stats in self.page_stats.values() if 'parse_ms' in stats]
+        return {
+            'pages': len(self.page_stats),
+            'parsed': len(parsed),
+            'skipped': sum(1 for stats in self.page_stats.values() if 'skipped' in stats),
+            'bytes': sum(stats['bytes'] for stats in self.page_stats.values()),
+            'decode_ms': round(sum(stats['decode_ms'] for stats in parsed), 1),
+            'parse_ms': round(sum(stats['parse_ms'] for stats in parsed), 1),
+        }
+
+    def canonical_link(self, base_url, href):
+        # 같은 호스트의 http(s) 링크만 정규화해서 반환
+        absolute_url = urljoin(base_url, href)
+        if urlparse(absolute_url).scheme not in ('http', 'https'):
+            return None
+        absolute_url = canonicalize_url(absolute_url)
+        return absolute_url if urlparse(absolute_url).netloc == self.base_domain else None
+
+    def remaining_seconds(self):
+        if self.deadline_at is None:
+            return None
+        return max(self.deadline_at - time.monotonic(), 0)
+
+    def budget_exhausted(self):
+        if self.max_bytes > 0 and self.bytes_fetched >= self.max_bytes:
+            return True
+        return self.deadline_at is not None and time.monotonic() >= self.deadline_at
+
+    async def discover_seeds(self, session):
+        """robots.txt의 Sitemap/Allow 항목과 sitemap(.xml, index 포함)의 URL을 모은다."""
+        parsed = urlparse(self.start_url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        seeds = []
+
+        robots = await site_files.fetch(session, f"{origin}/robots.txt", ANALYZER_REQUEST_TIMEOUT)
+        sitemap_queue = deque([f"{origin}/sitemap.xml"])
+        if robots:
+            sitemaps, paths = parse_robots(robots)
+            sitemap_queue.extendleft(reversed(sitemaps))
+            seeds.extend(urljoin(origin, path) for path in paths)
+
         visited = set()
-        queue = [(self.start_url, 0)]
+        while sitemap_queue and len(visited) < CRAWLER_MAX_SITEMAPS:
+            sitemap_url = sitemap_queue.popleft()
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+            content = await site_files.fetch(session, sitemap_url, ANALYZER_REQUEST_TIMEOUT)
+            if not content:
+                continue
+            locations, is_index = parse_sitemap(content)
+            if is_index:
+                sitemap_queue.extend(locations)
+            else:
+                seeds.extend(locations)
+
+        return [link for link in dict.fromkeys(filter(None, (self.canonical_link(origin, seed) for seed in seeds)))]
+
+    async def fetch_worker(self, queue, session, results):
+        while True:
+            url = await queue.get()
+            try:
+                # 예산을 다 쓴 뒤에 남은 URL은 요청하지 않음
+                if self.budget_exhausted():
+                    continue
+                semaphore = self.host_semaphores.setdefault(
+                    urlparse(url).netloc, asyncio.Semaphore(self.max_per_host)
+                )
+                async with semaphore:
+                    results[url] = await self.extract_links_and_parse(url, session)
+            finally:
+                queue.task_done()
+
+    async def fetch_frontier(self, frontier, session):
+        # 현재 depth의 URL들을 worker pool로 동시에 요청
+        queue = asyncio.Queue()
+        for url in frontier:
+            queue.put_nowait(url)
+
+        results = {}
+        workers = [
+            asyncio.create_task(self.fetch_worker(queue, session, results))
+            for _ in range(min(self.max_workers, len(frontier)))
+        ]
+        try:
+            await asyncio.wait_for(queue.join(), self.remaining_seconds())
+        except asyncio.TimeoutError:
+            logging.info(f"time budget {self.max_seconds}s reached for {self.start_url}")
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return results
+
+    def add_child(self, parent_node, link, depth, queue):
+        # 이미 트리에 있는 URL은 처음 발견한 부모 아래에만 둠
+        if link in self.node_index:
+            return
+        child_node = self.clusters.admit_link(link, lambda: {"url": link, "details": None, "children": []})
+        if child_node is None:
+            return
+        queue.append((link, depth))
+        self.node_index[link] = child_node
+        parent_node["children"].append(child_node)
+
+    async def crawl_bfs(self, session):
+        self.bytes_fetched = 0
+        self.page_stats = {}
+        self.clusters = ClusterIndex(self.cluster_samples, self.simhash_distance)
+        self.fingerprints = {}
+        self.deadline_at = time.monotonic() + self.max_seconds if self.max_seconds > 0 else None
+
+        queue = deque([(self.start_url, 0)])
         result_tree = {"url": self.start_url, "details": None, "children": []}
+        # 시작 URL은 입력한 형태와 정규화된 형태 모두로 찾을 수 있게 등록
+        self.node_index = {self.start_url: result_tree, canonicalize_url(self.start_url): result_tree}
+        pages_fetched = 0
+
+        if self.seed_from_site_files:
+            # sitemap/robots에서 찾은 URL은 시작 페이지의 자식(depth 1)으로 둠
+            seeds = await self.discover_seeds(session)
+            if self.max_pages > 0:
+                seeds = seeds[: self.max_pages]
+            for link in seeds:
+                self.add_child(result_tree, link, 1, queue)
 
         while queue:
-            url, depth = queue.pop(0)
+            # 같은 depth의 URL을 하나의 frontier로 모음 (node_index로 이미 중복 제거됨)
+            depth = queue[0][1]
+            if self.max_depth > 0 and depth > self.max_depth:
+                break
 
-            # depth check
-            if url in visited or (self.max_depth > 0 and depth > self.max_depth):
-                continue
+            frontier = []
+            while queue and queue[0][1] == depth:
+                frontier.append(queue.popleft()[0])
+
+            if self.max_pages > 0:
+                frontier = frontier[: self.max_pages - pages_fetched]
+            if not frontier:
+                break
+
+            logging.info(f"depth {depth}: fetching {len(frontier)} urls")
+            results = await self.fetch_frontier(frontier, session)
+            pages_fetched += len(frontier)
+
+            # 요청 순서와 무관하게 frontier 순서대로 트리에 반영
+            for url in frontier:
+                links, page_data = results.get(url, ([], None))
 
-            visited.add(url)
-            logging.info(f"{url}   depth {depth}")
+                current_node = self.node_index.get(url)
+                if current_node:
+                    current_node["details"] = page_data
+                    if self.on_page:
+                        await self.on_page(url, page_data)
 
-            links, page_data = await self.extract_links_and_parse(url, session)
+                    # 구조가 같은 페이지를 이미 충분히 탐색했으면 링크를 더 따라가지 않음
+                    if not self.clusters.admit_page(current_node, self.fingerprints.get(url)):
+                        continue
 
-            current_node = self.find_node(result_tree, url)
-            if current_node:
-                current_node["details"] = page_data
-                current_node["children"] = []
+                    for link in links:
+                        self.add_child(current_node, link, depth + 1, queue)
 
-                for link in links:
-                    if link not in visited and urlparse(link).netloc == self.base_domain:
-                        queue.append((link, depth + 1))
-                        child_node = {"url": link, "details": None, "children": []}
-                        current_node["children"].append(child_node)
+            if self.max_pages > 0 and pages_fetched >= self.max_pages:
+                logging.info(f"page budget {self.max_pages} reached for {self.start_url}")
+                break
+            if self.budget_exhausted():
+                logging.info(
+                    f"crawl budget reached for {self.start_url} "
+                    f"({self.bytes_fetched} bytes, {pages_fetched} pages)"
+                )
+                break
 
         return result_tree
 
-    def find_node(self, tree, target_url):
+    @staticmethod
+    def find_node(tree, target_url):
         if tree["url"] == target_url:
             return tree
         for child in tree.get("children", []):
-            result = self.find_node(child, target_url)
+            result = SubdomainDirectoryCrawler.find_node(child, target_url)
             if result:
                 return result
         return None
 
     async def run(self):
-        async with aiohttp.ClientSession() as session:
+        async with http_client.session_scope() as session:
             logging.info(f"======== START {self.start_url} ========")
             result_tree = await self.crawl_bfs(session)
+        logging.info(f"crawl stats for {self.start_url}: {self.stats_summary()}")
 
         # save as JSON
         if result_tree:
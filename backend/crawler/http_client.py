@@ -0,0 +1,74 @@
+import ssl
+import logging
+import aiohttp
+import certifi
+from contextlib import asynccontextmanager
+from backend.config import HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_DNS_CACHE_TTL, HTTP_KEEPALIVE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """애플리케이션 전체에서 공유하는 aiohttp 세션 (keep-alive 연결 풀, 호스트별 제한, DNS 캐시, TLS 컨텍스트)."""
+
+    def __init__(
+        self,
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        dns_cache_ttl=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.session = None
+
+        # TLS 컨텍스트는 한 번만 만들어 모든 연결에서 재사용
+        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
+        self.insecure_ssl_context = ssl.create_default_context()
+        self.insecure_ssl_context.check_hostname = False
+        self.insecure_ssl_context.verify_mode = ssl.CERT_NONE
+
+    @property
+    def is_running(self):
+        return self.session is not None and not self.session.closed
+
+    def create_connector(self):
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+            ssl=self.ssl_context,
+        )
+
+    async def start(self):
+        if not self.is_running:
+            # 여러 사용자와 스캔이 함께 쓰므로 공유 세션은 쿠키를 저장하지 않음
+            self.session = aiohttp.ClientSession(connector=self.create_connector(), cookie_jar=aiohttp.DummyCookieJar())
+            logger.info("Shared HTTP client started")
+
+    async def close(self):
+        if self.is_running:
+            await self.session.close()
+            logger.info("Shared HTTP client closed")
+        self.session = None
+
+    @asynccontextmanager
+    async def session_scope(self):
+        # 공유 세션이 있으면 그 연결 풀을 빌려 쓰는 세션을 만들고, 없으면 (CLI 실행 등) 임시 세션을 만들어 사용
+        # 어느 쪽이든 쿠키는 이 범위(크롤링 한 번, 분석 한 번) 안에서만 유지됨
+        if self.is_running:
+            session = aiohttp.ClientSession(connector=self.session.connector, connector_owner=False)
+            try:
+                yield session
+            finally:
+                await session.close()
+        else:
+            async with aiohttp.ClientSession(connector=self.create_connector()) as session:
+                yield session
+
+
+http_client = HttpClient()
@@ -0,0 +1,99 @@
+import codecs
+import json
+import re
+
+# 원소 하나가 이 크기를 넘으면 잘못된 JSON으로 보고 중단
+MAX_ITEM_SIZE = 16 * 1024 * 1024
+WHITESPACE = ' \t\r\n'
+
+
+class JSONArrayStream:
+    """
+    JSON 배열을 조각(chunk) 단위로 받아 원소를 하나씩 디코딩한다.
+    key를 주면 {"key": [...]} 형태에서 해당 키의 배열을 읽는다.
+    전체 응답 대신 아직 끝나지 않은 원소 하나만 버퍼에 남기므로 메모리 사용량이 일정하다.
+    """
+
+    def __init__(self, key=None):
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.buffer = ''
+        self.done = False
+        self.started = False
+        self.start_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key)) if key else re.compile(r'\s*\[')
+
+    def feed(self, chunk):
+        if isinstance(chunk, bytes):
+            chunk = self.text_decoder.decode(chunk)
+        if self.done:
+            return []
+        self.buffer += chunk
+
+        if not self.started and not self.find_start():
+            return []
+        return self.decode_items()
+
+    def find_start(self):
+        match = self.start_pattern.search(self.buffer)
+        if match is None:
+            # 시작 패턴이 조각 경계에 걸쳐 있을 수 있으므로 끝부분만 남김
+            self.buffer = self.buffer[-256:]
+            return False
+        self.buffer = self.buffer[match.end():]
+        self.started = True
+        return True
+
+    def decode_items(self):
+        items = []
+        buffer = self.buffer
+        index = 0
+        length = len(buffer)
+
+        while True:
+            while index < length and (buffer[index] in WHITESPACE or buffer[index] == ','):
+                index += 1
+            if index >= length:
+                break
+            if buffer[index] == ']':
+                self.done = True
+                index += 1
+                break
+            try:
+                item, end = self.decoder.raw_decode(buffer, index)
+            except json.JSONDecodeError:
+                break
+            # 숫자 등이 조각 경계에서 잘렸을 수 있으므로 뒤에 문자가 더 있을 때만 확정
+            if end >= length:
+                break
+            items.append(item)
+            index = end
+
+        self.buffer = buffer[index:]
+        if len(self.buffer) > MAX_ITEM_SIZE:
+            raise ValueError("JSON array item exceeds maximum size")
+        return items
+
+    def close(self):
+        items = self.feed(self.text_decoder.decode(b'', final=True) + ' ')
+        if not self.done:
+            raise ValueError("JSON array ended unexpectedly")
+        return items
+
+
+async def iter_json_array(chunks, key=None):
+    stream = JSONArrayStream(key)
+    async for chunk in chunks:
+        for item in stream.feed(chunk):
+            yield item
+    for item in stream.close():
+        yield item
+
+
+def iter_json_array_file(file, key=None, chunk_size=1024 * 1024):
+    stream = JSONArrayStream(key)
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        yield from stream.feed(chunk)
+    yield from stream.close()
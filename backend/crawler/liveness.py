@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import aiohttp
+from urllib.parse import urlparse
+from backend.config import (
+    LIVENESS_CONCURRENCY,
+    LIVENESS_CONNECT_TIMEOUT,
+    LIVENESS_REQUEST_TIMEOUT,
+    LIVENESS_BODY_BYTES,
+)
+from backend.crawler.http_client import http_client
+from backend.crawler.resolver import resolver
+
+# 연결을 시도할 포트와 스킴 (HTTPS 우선)
+PROBE_PORTS = [(443, 'https'), (80, 'http')]
+
+
+class LivenessProber:
+    """
+    깊은 분석 전에 서브 도메인이 실제로 살아 있는지 빠르게 확인한다.
+    DNS 조회 -> 443/80 TCP 연결 -> 가벼운 GET (본문 앞부분만) 순서로 진행하고,
+    최종 URL이나 본문 해시가 같은 호스트(메인 사이트로 리다이렉트, 같은 기본 페이지 등)는 하나로 합친다.
+    """
+
+    def __init__(
+        self,
+        concurrency=LIVENESS_CONCURRENCY,
+        connect_timeout=LIVENESS_CONNECT_TIMEOUT,
+        request_timeout=LIVENESS_REQUEST_TIMEOUT,
+        body_bytes=LIVENESS_BODY_BYTES,
+        ports=PROBE_PORTS,
+    ):
+        self.ports = ports
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.body_bytes = body_bytes
+
+    async def connect(self, ip, port):
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), self.connect_timeout)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    async def fetch(self, session, url):
+        async with session.get(
+            url,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            ssl=http_client.insecure_ssl_context,
+            allow_redirects=True,
+        ) as response:
+            # 본문 전체가 아니라 앞부분만 읽어 해시 계산
+            body = await response.content.read(self.body_bytes)
+            return response.status, str(response.url), body
+
+    @staticmethod
+    def origin(scheme, host, port):
+        default_port = 443 if scheme == 'https' else 80
+        return f"{scheme}://{host}" if port == default_port else f"{scheme}://{host}:{port}"
+
+    async def probe(self, session, host, ip):
+        if not ip:
+            return None
+        async with self.semaphore:
+            for port, scheme in self.ports:
+                if not await self.connect(ip, port):
+                    continue
+                try:
+                    status, final_url, body = await self.fetch(session, self.origin(scheme, host, port))
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    continue
+                return {
+                    "host": host,
+                    "ip": ip,
+                    "url": self.origin(scheme, host, port),
+                    "status": status,
+                    "final_url": normalize_final_url(final_url),
+                    "body_hash": hashlib.sha256(body).hexdigest() if body else None,
+                }
+            return None
+
+    async def filter_live(self, hosts, main_url=None):
+        """
+        살아 있고 서로 다른 내용을 제공하는 호스트만 입력 순서대로 반환한다.
+        반환값: (probe 결과 목록, 대표 호스트 -> 합쳐진 호스트 목록, 응답이 없는 호스트 목록)
+        """
+        hosts = list(dict.fromkeys(hosts))
+        main_host = urlparse(main_url).hostname if main_url else None
+        # DNS 조회는 먼저 한 번에 (이름이 없는 호스트는 연결을 시도하지 않음)
+        ips = await resolver.resolve_many(hosts + [main_host] if main_host else hosts)
+        async with http_client.session_scope() as session:
+            probes = [self.probe(session, host, ips[host]) for host in hosts]
+            if main_host:
+                probes.append(self.probe(session, main_host, ips[main_host]))
+            results = await asyncio.gather(*probes)
+
+        # 메인 사이트와 같은 내용을 제공하는 호스트도 따로 분석하지 않음
+        seen = {}
+        if main_host and results[-1] is not None:
+            main = results.pop()
+            seen[("url", main["final_url"])] = main_host
+            if main["body_hash"]:
+                seen[("body", main["body_hash"])] = main_host
+        elif main_host:
+            results.pop()
+
+        live, collapsed, dead = [], {}, []
+        for host, result in zip(hosts, results):
+            if result is None:
+                dead.append(host)
+                continue
+            keys = [("url", result["final_url"])]
+            if result["body_hash"]:
+                keys.append(("body", result["body_hash"]))
+            representative = next((seen[key] for key in keys if key in seen), None)
+            if representative is not None:
+                collapsed.setdefault(representative, []).append(host)
+                continue
+            for key in keys:
+                seen[key] = host
+            live.append(result)
+        return live, collapsed, dead
+
+
+def normalize_final_url(url):
+    parsed = urlparse(url)
+    path = parsed.path.rstrip('/') or '/'
+    return f"{parsed.scheme}://{parsed.netloc.lower()}{path}" + (f"?{parsed.query}" if parsed.query else '')
+
+
+liveness_prober = LivenessProber()
@@ -1,41 +1,128 @@
 import aiohttp
+import codecs
+import re
 from bs4 import BeautifulSoup
 
+# lxml이 설치되어 있으면 더 빠른 lxml 파서를 사용하고, 없으면 내장 html.parser 사용
+try:
+    import lxml  # noqa: F401
+    PARSER_BACKEND = 'lxml'
+except ImportError:
+    PARSER_BACKEND = 'html.parser'
+
+
+# Content-Type 헤더에 charset이 없을 때 문서 앞부분의 <meta charset>으로 인코딩 확인
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_-]+)', re.IGNORECASE)
+
+
+class ParsedDocument:
+    """HTML을 한 번만 파싱하고, 크롤러와 분석기에서 쓰는 태그 정보를 한 번의 트리 순회로 모아둔다."""
+
+    def __init__(self, html_content):
+        self.title = None
+        self.links = []
+        self.inputs = []
+        self.meta = []
+        self.scripts = []
+        self.link_tags = []
+        self.styles = []
+        self.attributes = set()
+        # 페이지 구조 특징 (문서 순서대로의 태그 경로 + 폼/입력 필드 시그니처), 중복 페이지 판별에 사용
+        self.structure = []
+
+        soup = BeautifulSoup(html_content, PARSER_BACKEND)
+        self.walk(soup)
+        soup.decompose()
+
+    def walk(self, soup):
+        # find_all은 문서 순서(부모가 먼저)로 태그를 돌려주므로 부모의 경로를 이어 붙일 수 있음
+        paths = {id(soup): ''}
+        for tag in soup.find_all(True):
+            self.attributes.update(tag.attrs)
+            name = tag.name
+            path = f"{paths.get(id(tag.parent), '')}/{name}"
+            paths[id(tag)] = path
+            self.structure.append(path)
+
+            if name == 'a':
+                href = tag.get('href')
+                if href is not None:
+                    self.links.append(href)
+            elif name == 'input':
+                self.inputs.append({
+                    'name': tag.get('name', ''),
+                    'type': tag.get('type', ''),
+                    'id': tag.get('id', ''),
+                    'value': tag.get('value', ''),
+                })
+                self.structure.append(f"input:{tag.get('type', '')}:{tag.get('name', '')}")
+            elif name == 'form':
+                self.structure.append(f"form:{tag.get('method', 'get').lower()}:{tag.get('action', '')}")
+            elif name == 'meta':
+                self.meta.append({'name': tag.get('name', ''), 'content': tag.get('content')})
+            elif name == 'script':
+                content = str(tag.string) if tag.string is not None else None
+                self.scripts.append({'src': tag.get('src'), 'content': content})
+            elif name == 'link':
+                self.link_tags.append({'href': tag.get('href', ''), 'rel': tag.get('rel', [])})
+            elif name == 'style':
+                if tag.string:
+                    self.styles.append(str(tag.string))
+            elif name == 'title' and self.title is None:
+                self.title = str(tag.string) if tag.string else None
+
+
 class Parser:
     @staticmethod
     def get_soup(html_content):
-        return BeautifulSoup(html_content, 'html.parser')
+        return BeautifulSoup(html_content, PARSER_BACKEND)
 
     @staticmethod
-    async def extract_page_data(url, html_content, response):
-        soup = Parser.get_soup(html_content)
+    def decode(body, charset=None):
+        if charset is None:
+            match = META_CHARSET_PATTERN.search(body[:4096])
+            charset = match.group(1).decode('ascii') if match else 'utf-8'
+        try:
+            codecs.lookup(charset)
+        except LookupError:
+            charset = 'utf-8'
+        return body.decode(charset, errors='replace')
 
+    @staticmethod
+    def parse(html_content):
+        return ParsedDocument(html_content)
+
+    @staticmethod
+    async def extract_page_data(url, document, response):
         page_data = {
             'url': url,
-            'title': soup.title.string if soup.title else 'No Title',
-            'csrf_token': Parser.extract_csrf_token(soup),
+            'title': document.title if document.title else 'No Title',
+            'csrf_token': Parser.extract_csrf_token(document),
             'cookies': {cookie.key: cookie.value for cookie in response.cookies.values()},
-            'input_tags': [{'name': input.get('name', ''), 'type': input.get('type', ''), 'id': input.get('id', ''), 'value': input.get('value', '')}
-                           for input in soup.find_all('input')]
+            'input_tags': document.inputs,
         }
 
         return page_data
 
     @staticmethod
-    def extract_csrf_token(soup):
+    def extract_csrf_token(document):
         # Find various tags
         potential_names = ['csrf-token', 'csrf_token', 'authenticity_token', 'xsrf-token']
 
         # Find from  Meta tag
+        meta_by_name = {}
+        for meta in document.meta:
+            meta_by_name.setdefault(meta['name'], meta)
         for name in potential_names:
-            csrf_meta = soup.find('meta', attrs={'name': name})
-            if csrf_meta:
-                return csrf_meta.get('content')
+            if name in meta_by_name:
+                return meta_by_name[name]['content']
 
         # Find from  Input tag
+        input_by_name = {}
+        for input in document.inputs:
+            input_by_name.setdefault(input['name'], input)
         for name in potential_names:
-            csrf_input = soup.find('input', attrs={'name': name})
-            if csrf_input:
-                return csrf_input.get('value')
+            if name in input_by_name:
+                return input_by_name[name]['value'] or None
 
         return None
@@ -0,0 +1,92 @@
+import re
+import tldextract
+from backend.config import PUBLIC_SUFFIX_FILE
+
+# 트라이 노드에서 규칙의 끝을 표시하는 키
+RULE = ''
+EXCEPTION = '!'
+
+
+class PublicSuffixTrie:
+    """
+    Public Suffix List 규칙을 라벨 역순(kr -> co -> ...)의 트라이로 저장한다.
+    와일드카드(*.ck)와 예외(!www.ck) 규칙을 지원하며, tldextract 기본값과 같이 ICANN 영역만 사용한다.
+    """
+
+    def __init__(self, rules=()):
+        self.root = {}
+        for rule in rules:
+            self.add(rule)
+
+    def add(self, rule):
+        exception = rule.startswith('!')
+        labels = rule.lstrip('!').lower().split('.')
+        node = self.root
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        node[EXCEPTION if exception else RULE] = True
+
+    @classmethod
+    def load(cls, path=None, include_private=False):
+        """
+        path(기본값: PUBLIC_SUFFIX_FILE)의 Public Suffix List 파일을 읽는다.
+        파일을 지정하지 않으면 tldextract에 포함된 목록을 공개 API(TLDExtract.tlds)로 가져온다 (네트워크 조회 없음).
+        """
+        path = path or PUBLIC_SUFFIX_FILE
+        if not path:
+            extractor = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None, include_psl_private_domains=include_private)
+            return cls(extractor.tlds)
+
+        rules = []
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                line = line.strip()
+                if line.startswith('// ===BEGIN PRIVATE DOMAINS===') and not include_private:
+                    break
+                if line and not line.startswith('//'):
+                    rules.append(line.split()[0])
+        return cls(rules)
+
+    def suffix_length(self, labels):
+        """역순 라벨 목록에서 공개 접미사가 차지하는 라벨 수 (일치하는 규칙이 없으면 마지막 라벨 하나)."""
+        length = 1
+        node = self.root
+        for depth, label in enumerate(labels, start=1):
+            wildcard = node.get('*')
+            node = node.get(label)
+            if wildcard is not None and (node is None or EXCEPTION not in node):
+                length = depth
+            if node is None:
+                break
+            if EXCEPTION in node:
+                return depth - 1
+            if RULE in node:
+                length = depth
+        return length
+
+    def registered_domain(self, host):
+        """www.example.co.kr -> example.co.kr, 공개 접미사 자체이거나 빈 값이면 None."""
+        host = host.strip().lower().rstrip('.')
+        if not host:
+            return None
+        labels = host.split('.')
+        length = self.suffix_length(reversed(labels))
+        if length >= len(labels):
+            return None
+        return '.'.join(labels[-(length + 1):])
+
+
+# 모듈 import 시 한 번만 로드
+PUBLIC_SUFFIXES = PublicSuffixTrie.load()
+
+
+def registered_domain(host):
+    return PUBLIC_SUFFIXES.registered_domain(host)
+
+
+def strip_url(value):
+    # 프로토콜, 경로, 포트, 사용자 정보를 제거하고 호스트 이름만 남김
+    value = re.sub(r'^[a-zA-Z][a-zA-Z0-9+.-]*://', '', value.strip())
+    value = re.split(r'[/?#]', value, maxsplit=1)[0]
+    value = value.rsplit('@', 1)[-1]
+    return value.split(':', 1)[0].lower().rstrip('.')
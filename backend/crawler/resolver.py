@@ -0,0 +1,90 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from backend.config import DNS_CACHE_TTL, DNS_NEGATIVE_CACHE_TTL, DNS_CONCURRENCY
+
+# aiodns가 설치되어 있으면 c-ares 기반 비동기 조회를 사용하고, 없으면 이벤트 루프의 getaddrinfo 사용
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncResolver:
+    """이벤트 루프를 막지 않는 DNS 조회와 성공/실패 결과의 TTL 캐시."""
+
+    def __init__(self, ttl=DNS_CACHE_TTL, negative_ttl=DNS_NEGATIVE_CACHE_TTL, concurrency=DNS_CONCURRENCY):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # host -> (만료 시각, IP 또는 실패 시 None)
+        self.cache = {}
+        # 같은 호스트에 대한 동시 조회는 하나로 합침
+        self.pending = {}
+        self.dns = None
+
+    def cached(self, host):
+        entry = self.cache.get(host)
+        if entry is None:
+            return False, None
+        expires_at, ip = entry
+        if expires_at < time.monotonic():
+            del self.cache[host]
+            return False, None
+        return True, ip
+
+    async def lookup(self, host):
+        if aiodns is not None:
+            if self.dns is None:
+                self.dns = aiodns.DNSResolver()
+            result = await self.dns.gethostbyname(host, socket.AF_INET)
+            return result.addresses[0] if result.addresses else None
+
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+        return infos[0][4][0] if infos else None
+
+    async def resolve_uncached(self, host):
+        async with self.semaphore:
+            try:
+                ip = await self.lookup(host)
+            except Exception as e:
+                logger.info(f"Could not resolve {host}: {e}")
+                ip = None
+        ttl = self.ttl if ip else self.negative_ttl
+        self.cache[host] = (time.monotonic() + ttl, ip)
+        return ip
+
+    async def resolve(self, host):
+        try:
+            return str(ipaddress.ip_address(host))
+        except ValueError:
+            pass
+
+        found, ip = self.cached(host)
+        if found:
+            return ip
+
+        if host not in self.pending:
+            self.pending[host] = asyncio.ensure_future(self.resolve_uncached(host))
+            self.pending[host].add_done_callback(lambda _: self.pending.pop(host, None))
+        return await asyncio.shield(self.pending[host])
+
+    def purge_expired(self):
+        now = time.monotonic()
+        for host in [host for host, (expires_at, _) in self.cache.items() if expires_at < now]:
+            del self.cache[host]
+
+    async def resolve_many(self, hosts):
+        # 호스트 -> IP (실패하면 None), 조회할 때마다 만료된 캐시 항목을 정리
+        self.purge_expired()
+        hosts = list(dict.fromkeys(hosts))
+        ips = await asyncio.gather(*(self.resolve(host) for host in hosts))
+        return dict(zip(hosts, ips))
+
+
+resolver = AsyncResolver()
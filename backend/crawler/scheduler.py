@@ -0,0 +1,134 @@
+import asyncio
+import heapq
+import itertools
+from collections import defaultdict
+from backend.config import SCAN_MAX_CONCURRENCY, SCAN_MAX_PER_SCAN, SCAN_MAX_PER_USER
+
+# 우선순위 값이 작을수록 먼저 실행
+PRIORITY_MAIN_DOMAIN = 0
+PRIORITY_SUBDOMAIN = 1
+
+
+class ScanScheduler:
+    """전역 동시 실행 수와 스캔별/사용자별 할당량을 지키면서 우선순위 순서로 분석 작업을 실행한다."""
+
+    def __init__(
+        self,
+        max_concurrency=SCAN_MAX_CONCURRENCY,
+        max_per_scan=SCAN_MAX_PER_SCAN,
+        max_per_user=SCAN_MAX_PER_USER,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_per_scan = max_per_scan
+        self.max_per_user = max_per_user
+        # (user_id, scan_id) -> 해당 스캔의 대기 작업 힙
+        self.queues = {}
+        # 각 스캔의 맨 앞 작업만 올라가는 전역 힙: (우선순위, 순번, (user_id, scan_id))
+        self.ready = []
+        self.active = set()
+        # 할당량에 막힌 스캔은 그 스캔/사용자의 실행 수가 줄어들 때까지 다시 보지 않음
+        self.parked_scans = set()
+        self.parked_by_user = defaultdict(set)
+        self.counter = itertools.count()
+        self.in_flight = 0
+        self.in_flight_by_scan = defaultdict(int)
+        self.in_flight_by_user = defaultdict(int)
+
+    def activate(self, key):
+        queue = self.queues.get(key)
+        # 취소된 대기 작업은 맨 앞에 올 때 정리
+        while queue and queue[0][2].done():
+            heapq.heappop(queue)
+        if not queue:
+            self.queues.pop(key, None)
+            return
+        if key not in self.active:
+            self.active.add(key)
+            heapq.heappush(self.ready, (queue[0][0], queue[0][1], key))
+
+    def dispatch(self):
+        # 스캔마다 맨 앞 작업만 보고, 할당량에 막힌 스캔은 힙에서 빼 둔다 (작업 하나당 O(log n))
+        while self.ready and self.in_flight < self.max_concurrency:
+            _, count, key = heapq.heappop(self.ready)
+            queue = self.queues.get(key)
+            if not queue or queue[0][1] != count:
+                # 더 앞선 작업이 들어와 다시 올라간 항목
+                continue
+            self.active.discard(key)
+            if queue[0][2].done():
+                self.activate(key)
+                continue
+            user_id, scan_id = key
+            if self.in_flight_by_scan[scan_id] >= self.max_per_scan:
+                self.parked_scans.add(key)
+                continue
+            if self.in_flight_by_user[user_id] >= self.max_per_user:
+                self.parked_by_user[user_id].add(key)
+                continue
+            _, _, future = heapq.heappop(queue)
+            self.in_flight += 1
+            self.in_flight_by_scan[scan_id] += 1
+            self.in_flight_by_user[user_id] += 1
+            future.set_result(None)
+            self.activate(key)
+
+    def release(self, user_id, scan_id):
+        self.in_flight -= 1
+        self.in_flight_by_scan[scan_id] -= 1
+        if self.in_flight_by_scan[scan_id] <= 0:
+            del self.in_flight_by_scan[scan_id]
+        self.in_flight_by_user[user_id] -= 1
+        if self.in_flight_by_user[user_id] <= 0:
+            del self.in_flight_by_user[user_id]
+
+        key = (user_id, scan_id)
+        if key in self.parked_scans:
+            self.parked_scans.discard(key)
+            self.activate(key)
+        for parked in self.parked_by_user.pop(user_id, ()):
+            self.activate(parked)
+        self.dispatch()
+
+    async def run(self, job, user_id, scan_id, priority=(PRIORITY_SUBDOMAIN,)):
+        future = asyncio.get_running_loop().create_future()
+        key = (user_id, scan_id)
+        heapq.heappush(self.queues.setdefault(key, []), (priority, next(self.counter), future))
+        if key in self.active:
+            # 새 작업이 맨 앞이 되었으면 전역 힙의 항목을 새로 올림 (이전 항목은 꺼낼 때 무시됨)
+            if self.queues[key][0][2] is future:
+                self.active.discard(key)
+                self.activate(key)
+        elif key not in self.parked_scans and key not in self.parked_by_user.get(user_id, ()):
+            self.activate(key)
+        self.dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # 대기 중에 취소된 경우 실행 슬롯을 차지하지 않음
+            if future.done() and not future.cancelled():
+                self.release(user_id, scan_id)
+            raise
+
+        try:
+            return await job()
+        finally:
+            self.release(user_id, scan_id)
+
+    def stats(self):
+        queued_by_scan = defaultdict(int)
+        for (_, scan_id), queue in self.queues.items():
+            for _, _, future in queue:
+                if not future.done():
+                    queued_by_scan[scan_id] += 1
+        return {
+            "queued": sum(queued_by_scan.values()),
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "queued_by_scan": dict(queued_by_scan),
+            "in_flight_by_scan": dict(self.in_flight_by_scan),
+            "in_flight_by_user": dict(self.in_flight_by_user),
+        }
+
+
+scheduler = ScanScheduler()
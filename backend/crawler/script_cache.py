@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from backend.config import (
+    SCRIPT_CACHE_MAX_ENTRIES,
+    SCRIPT_CACHE_FRESH_SECONDS,
+    SCRIPT_CACHE_TTL_SECONDS,
+    SCRIPT_CACHE_MONGODB,
+)
+from backend.database.mongodb import script_cache_collection
+from backend.database.indexes import create_indexes
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class LRUTier:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry['expires_at'] < time.time():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class ScriptCache:
+    """
+    외부 스크립트 분석 결과(signature hit 목록) 캐시.
+    - URL 키: ETag/Last-Modified와 함께 저장, fresh 기간 안에는 요청 자체를 생략하고 이후에는 조건부 요청으로 재검증
+    - 내용 해시 키: 다른 URL에서 같은 파일을 받은 경우 정규식 분석을 생략
+    메모리 LRU를 먼저 보고, 설정된 경우 MongoDB(TTL 인덱스로 만료)를 2차 저장소로 사용한다.
+    """
+
+    def __init__(
+        self,
+        max_entries=SCRIPT_CACHE_MAX_ENTRIES,
+        fresh_seconds=SCRIPT_CACHE_FRESH_SECONDS,
+        ttl_seconds=SCRIPT_CACHE_TTL_SECONDS,
+        collection=None,
+    ):
+        self.fresh_seconds = fresh_seconds
+        self.ttl_seconds = ttl_seconds
+        self.memory = LRUTier(max_entries)
+        self.collection = collection
+        self.index_ready = False
+        # MongoDB 오류가 나면 잠시 메모리 캐시만 사용
+        self.collection_retry_at = 0.0
+
+    def ensure_index(self):
+        if not self.index_ready:
+            create_indexes(self.collection, "script_cache")
+            self.index_ready = True
+
+    def load(self, key):
+        self.ensure_index()
+        document = self.collection.find_one({"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}})
+        if document is None:
+            return None
+        document['expires_at'] = document['expires_at'].replace(tzinfo=timezone.utc).timestamp()
+        return document
+
+    def store(self, key, entry):
+        self.ensure_index()
+        document = dict(entry, expires_at=datetime.fromtimestamp(entry['expires_at'], timezone.utc))
+        self.collection.replace_one({"_id": key}, document, upsert=True)
+
+    def collection_available(self):
+        return self.collection is not None and self.collection_retry_at <= time.time()
+
+    def collection_failed(self, error):
+        logger.error(f"Script cache database unavailable, using memory only: {error}")
+        self.collection_retry_at = time.time() + 60
+
+    async def get(self, key):
+        entry = self.memory.get(key)
+        if entry is not None or not self.collection_available():
+            return entry
+        try:
+            entry = await asyncio.to_thread(self.load, key)
+        except Exception as e:
+            self.collection_failed(e)
+            return None
+        if entry is not None:
+            entry.pop('_id', None)
+            self.memory.put(key, entry)
+        return entry
+
+    async def put(self, key, entry):
+        entry['expires_at'] = time.time() + self.ttl_seconds
+        self.memory.put(key, entry)
+        if self.collection_available():
+            try:
+                await asyncio.to_thread(self.store, key, entry)
+            except Exception as e:
+                self.collection_failed(e)
+
+    async def get_url(self, url):
+        return await self.get(f"url:{url}")
+
+    def is_fresh(self, entry):
+        return entry['checked_at'] + self.fresh_seconds > time.time()
+
+    async def get_hash(self, digest):
+        return await self.get(f"sha256:{digest}")
+
+    async def put_result(self, url, digest, hits, etag=None, last_modified=None):
+        await self.put(f"sha256:{digest}", {'hits': hits})
+        await self.put(
+            f"url:{url}",
+            {
+                'hits': hits,
+                'sha256': digest,
+                'etag': etag,
+                'last_modified': last_modified,
+                'checked_at': time.time(),
+            },
+        )
+
+    async def touch_url(self, url, entry):
+        # 304 응답으로 재검증된 경우 fresh 기간만 갱신
+        entry = dict(entry, checked_at=time.time())
+        await self.put(f"url:{url}", entry)
+        return entry
+
+
+script_cache = ScriptCache(collection=script_cache_collection if SCRIPT_CACHE_MONGODB == "true" else None)
@@ -0,0 +1,109 @@
+import json
+import os
+import re
+
+SIGNATURE_FILE = os.path.join(os.path.dirname(__file__), 'json', 'signatures.json')
+
+
+class Signature:
+    """
+    signatures.json의 규칙 하나.
+    anchors: 매치가 항상 이 문자열 중 하나로 시작하는 리터럴 (없으면 본문 전체를 따로 검색)
+    """
+
+    def __init__(self, index, rule):
+        self.index = index
+        self.name = rule['name']
+        self.kind = rule.get('kind', '')
+        self.label = rule.get('label', rule['name'])
+        self.ignore_case = rule.get('ignore_case', False)
+        self.regex = re.compile(rule['pattern'], re.IGNORECASE if self.ignore_case else 0)
+        self.anchors = rule.get('anchors', [])
+
+
+class SignatureEngine:
+    """
+    모든 규칙의 anchor 리터럴을 하나의 정규식으로 합쳐 본문을 한 번만 훑고,
+    anchor가 나온 위치에서만 해당 규칙의 정규식을 확인한다.
+    """
+
+    def __init__(self, rules):
+        self.signatures = [Signature(index, rule) for index, rule in enumerate(rules)]
+        self.unanchored = [signature for signature in self.signatures if not signature.anchors]
+        self.automata = [
+            automaton
+            for automaton in (self.build_automaton(False), self.build_automaton(True))
+            if automaton is not None
+        ]
+
+    def build_automaton(self, ignore_case):
+        signatures = [s for s in self.signatures if s.anchors and s.ignore_case == ignore_case]
+        if not signatures:
+            return None
+
+        normalize = str.lower if ignore_case else str
+        anchors = {normalize(anchor) for signature in signatures for anchor in signature.anchors}
+
+        # anchor -> 그 anchor로 시작할 수 있는 규칙들 (짧은 anchor가 긴 anchor의 접두어인 경우 포함)
+        candidates = {}
+        for anchor in anchors:
+            candidates[anchor] = [
+                signature
+                for signature in signatures
+                if any(normalize(other).startswith(anchor) for other in signature.anchors)
+            ]
+
+        # 짧은 anchor를 먼저 두어 접두어 관계인 anchor가 가려지지 않게 함
+        pattern = '|'.join(re.escape(anchor) for anchor in sorted(anchors, key=len))
+        regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        return regex, normalize, candidates, len(signatures)
+
+    def scan(self, text):
+        if not text:
+            return []
+
+        found = {}
+        for regex, normalize, candidates, total in self.automata:
+            remaining = total
+            position = 0
+            while remaining > 0:
+                anchor_match = regex.search(text, position)
+                if anchor_match is None:
+                    break
+                for signature in candidates[normalize(anchor_match.group(0))]:
+                    if signature.index in found:
+                        continue
+                    match = signature.regex.match(text, anchor_match.start())
+                    if match:
+                        found[signature.index] = match
+                        remaining -= 1
+                # 겹치는 anchor도 찾을 수 있도록 한 글자씩만 이동
+                position = anchor_match.start() + 1
+
+        for signature in self.unanchored:
+            match = signature.regex.search(text)
+            if match:
+                found[signature.index] = match
+
+        return [
+            {
+                'name': self.signatures[index].name,
+                'kind': self.signatures[index].kind,
+                'label': self.signatures[index].label,
+                'groups': found[index].groups(),
+            }
+            for index in sorted(found)
+        ]
+
+
+def load_signatures(path=SIGNATURE_FILE):
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    return {category: SignatureEngine(rules) for category, rules in data.items()}
+
+
+# 모듈 import 시 한 번만 컴파일
+SIGNATURES = load_signatures()
+SERVER_SIGNATURES = SIGNATURES['server']
+ERROR_SIGNATURES = SIGNATURES['error']
+SCRIPT_SIGNATURES = SIGNATURES['script']
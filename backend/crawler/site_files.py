@@ -0,0 +1,85 @@
+import asyncio
+import gzip
+import html
+import logging
+import re
+import time
+import aiohttp
+from backend.config import SITE_FILE_CACHE_TTL, SITE_FILE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_LOC_PATTERN = re.compile(rb'<loc>\s*(.*?)\s*</loc>', re.IGNORECASE | re.DOTALL)
+
+
+class SiteFileCache:
+    """
+    robots.txt, sitemap.xml 같은 사이트 공통 파일을 URL별로 잠시 저장한다.
+    분석기(AdvancedWebAnalyzer)와 디렉토리 크롤러가 같은 파일을 동시에 요청해도 한 번만 받는다.
+    """
+
+    def __init__(self, ttl=SITE_FILE_CACHE_TTL, max_bytes=SITE_FILE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # url -> (만료 시각, 내용 또는 실패 시 None)
+        self.cache = {}
+        self.pending = {}
+
+    async def download(self, session, url, timeout):
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if response.status != 200:
+                    return None
+                return await response.content.read(self.max_bytes)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.info(f"Could not fetch {url}: {e}")
+            return None
+
+    async def download_and_store(self, session, url, timeout):
+        content = await self.download(session, url, timeout)
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self.cache.items() if expires_at < now]:
+            del self.cache[key]
+        self.cache[url] = (now + self.ttl, content)
+        return content
+
+    async def fetch(self, session, url, timeout):
+        entry = self.cache.get(url)
+        if entry is not None and entry[0] >= time.monotonic():
+            return entry[1]
+
+        if url not in self.pending:
+            self.pending[url] = asyncio.ensure_future(self.download_and_store(session, url, timeout))
+            self.pending[url].add_done_callback(lambda _: self.pending.pop(url, None))
+        return await asyncio.shield(self.pending[url])
+
+
+def parse_robots(content):
+    """robots.txt에서 (Sitemap URL 목록, Allow에 적힌 경로 목록)을 꺼낸다. Disallow 경로는 크롤링 대상으로 쓰지 않는다."""
+    sitemaps, paths = [], []
+    for line in content.decode('utf-8', errors='replace').splitlines():
+        line = line.split('#', 1)[0].strip()
+        field, _, value = line.partition(':')
+        field, value = field.strip().lower(), value.strip()
+        if not value:
+            continue
+        if field == 'sitemap':
+            sitemaps.append(value)
+        # 와일드카드가 없는 경로만 실제 URL로 사용할 수 있음
+        elif field == 'allow' and value.startswith('/') and '*' not in value:
+            paths.append(value.rstrip('$'))
+    return sitemaps, paths
+
+
+def parse_sitemap(content):
+    """sitemap에서 (<loc> URL 목록, sitemap index 여부)를 꺼낸다. gzip으로 압축된 sitemap도 처리."""
+    if content[:2] == b'\x1f\x8b':
+        try:
+            content = gzip.decompress(content)
+        except (OSError, EOFError):
+            return [], False
+    locations = [html.unescape(loc.decode('utf-8', errors='replace')) for loc in SITEMAP_LOC_PATTERN.findall(content)]
+    return locations, b'<sitemapindex' in content[:2048].lower()
+
+
+site_files = SiteFileCache()
@@ -0,0 +1,283 @@
+import asyncio
+import json
+import re
+import time
+from abc import ABC, abstractmethod
+import aiohttp
+from backend.config import SUBDOMAIN_SOURCES, SUBDOMAIN_FIXTURE_FILE, SUBDOMAIN_ZONE_FILE
+from backend.crawler.http_client import http_client
+from backend.crawler.jsonstream import iter_json_array
+
+
+class SourceError(Exception):
+    """재시도해도 소용없는 출처 오류 (4xx 응답, 잘못된 응답 형식 등)"""
+
+
+class RateLimiter:
+    """출처별 최소 요청 간격. 출처 객체는 모듈 단위로 공유되므로 모든 스캔에 함께 적용된다."""
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_at = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        # 다음 요청 시각을 먼저 예약한 뒤 기다리므로, 대기 중인 호출이 다른 호출을 막지 않음
+        now = time.monotonic()
+        start = max(now, self.next_at)
+        self.next_at = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+def normalize_hostnames(name_value):
+    # 인증서의 name_value는 줄바꿈으로 여러 SAN을 담고, 와일드카드(*.)를 포함할 수 있음
+    for name in name_value.split('\n'):
+        name = name.strip().lower().rstrip('.')
+        while name.startswith('*.'):
+            name = name[2:]
+        if name:
+            yield name
+
+
+class SubdomainSource(ABC):
+    """
+    서브 도메인 수집 출처의 공통 인터페이스.
+    fetch()는 찾은 호스트 이름을 하나씩 내보내는 async generator이며,
+    출처마다 신뢰도, 요청 제한 시간, 재시도 횟수, 분당 요청 수를 선언한다.
+    """
+
+    name = None
+    confidence = 0.5
+    timeout = 15
+    max_retries = 2
+    requests_per_minute = 0
+    # 결과를 discovery_cache에 저장할지 여부 (로컬 파일 출처는 저장하지 않음)
+    cacheable = True
+
+    def __init__(self):
+        self.rate_limiter = RateLimiter(self.requests_per_minute)
+
+    @abstractmethod
+    def fetch(self, session, domain):
+        """찾은 호스트 이름을 하나씩 내보내는 async generator"""
+
+
+class HttpSource(SubdomainSource):
+    """URL 하나를 조회해 응답 본문을 parse()로 해석하는 출처."""
+
+    url = None
+
+    def build_url(self, domain):
+        return self.url.format(domain=domain)
+
+    @abstractmethod
+    def parse(self, text):
+        """응답 본문 전체에서 호스트 이름 집합을 꺼낸다."""
+
+    async def read(self, response):
+        for subdomain in self.parse(await response.text()):
+            yield subdomain
+
+    async def fetch(self, session, domain):
+        url = self.build_url(domain)
+        for attempt in range(1, self.max_retries + 1):
+            await self.rate_limiter.wait()
+            try:
+                async with session.get(
+                    url,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    ssl=http_client.insecure_ssl_context,
+                ) as response:
+                    # 4xx는 재시도해도 같은 결과이므로 바로 실패 처리, 5xx만 재시도
+                    if 400 <= response.status < 500:
+                        raise SourceError(f"HTTP {response.status}")
+                    if response.status != 200:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status
+                        )
+                    async for subdomain in self.read(response):
+                        yield subdomain
+                    return
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    raise SourceError(f"{type(e).__name__}: {e}") from e
+                await asyncio.sleep(attempt)
+
+
+class CrtShSource(HttpSource):
+    name = 'crt.sh'
+    confidence = 0.9
+    timeout = 60
+    requests_per_minute = 30
+    url = "https://crt.sh/?q=%.{domain}&output=json"
+
+    def parse(self, text):
+        try:
+            entries = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise SourceError("Error decoding JSON from crt.sh") from e
+        return {
+            subdomain
+            for entry in entries if isinstance(entry, dict)
+            for subdomain in normalize_hostnames(entry.get('name_value', ''))
+        }
+
+    async def read(self, response):
+        # 응답 전체를 메모리에 올리지 않고 조각 단위로 파싱
+        try:
+            async for entry in iter_json_array(response.content.iter_chunked(64 * 1024)):
+                if isinstance(entry, dict):
+                    for subdomain in normalize_hostnames(entry.get('name_value', '')):
+                        yield subdomain
+        except ValueError as e:
+            raise SourceError(f"Error decoding JSON from crt.sh: {e}") from e
+
+
+class VirusTotalSource(HttpSource):
+    name = 'virustotal'
+    confidence = 0.8
+    # 공개 API 제한 (분당 4회)
+    requests_per_minute = 4
+    url = "https://www.virustotal.com/ui/domains/{domain}/subdomains"
+
+    def parse(self, text):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise SourceError("Error decoding JSON from VirusTotal") from e
+        return {item['id'].lower() for item in data.get('data', []) if 'id' in item}
+
+
+class HackerTargetSource(HttpSource):
+    name = 'hackertarget'
+    confidence = 0.7
+    requests_per_minute = 10
+    url = "https://api.hackertarget.com/hostsearch/?q={domain}"
+
+    # 정상 응답은 한 줄에 "호스트,IP"
+    LINE_PATTERN = re.compile(r'^([a-z0-9*_.-]+),[0-9a-f.:]*$', re.IGNORECASE)
+
+    def parse(self, text):
+        text = text.strip()
+        if not text or text == 'No records found':
+            return set()
+        subdomains = set()
+        for line in text.splitlines():
+            match = self.LINE_PATTERN.match(line.strip())
+            if match is None:
+                # "API count exceeded", "error check your search parameter" 등 오류 본문도 200으로 옴
+                raise SourceError(f"Unexpected response from HackerTarget: {text[:100]}")
+            subdomains.add(match.group(1).lower())
+        return subdomains
+
+
+class ThreatCrowdSource(HttpSource):
+    name = 'threatcrowd'
+    confidence = 0.5
+    # ThreatCrowd 권장 요청 간격 (10초에 1회)
+    requests_per_minute = 6
+    url = "https://www.threatcrowd.org/searchApi/v2/domain/report/?domain={domain}"
+
+    def parse(self, text):
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise SourceError("Error decoding JSON from ThreatCrowd") from e
+        return {subdomain.lower() for subdomain in data.get('subdomains', [])}
+
+
+def read_text(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+class FixtureSource(SubdomainSource):
+    """
+    네트워크 없이 테스트하기 위한 로컬 파일 출처.
+    {"example.com": ["a.example.com", ...]} 형태의 JSON 또는 한 줄에 호스트 하나인 텍스트 파일.
+    """
+
+    name = 'fixture'
+    confidence = 0.9
+    cacheable = False
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    async def fetch(self, session, domain):
+        text = await asyncio.to_thread(read_text, self.path)
+        try:
+            data = json.loads(text)
+            names = data.get(domain, []) if isinstance(data, dict) else data
+        except json.JSONDecodeError:
+            names = text.splitlines()
+        for name in names:
+            name = name.strip().lower().rstrip('.')
+            if name.endswith(f".{domain}"):
+                yield name
+
+
+class ZoneFileSource(SubdomainSource):
+    """BIND 형식 zone 파일에서 레코드 소유자 이름을 읽는 출처."""
+
+    name = 'zonefile'
+    confidence = 1.0
+    cacheable = False
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    @staticmethod
+    def owner_names(text, origin):
+        owner = origin
+        for line in text.splitlines():
+            line = line.split(';', 1)[0].rstrip()
+            if not line.strip():
+                continue
+            if line.startswith('$ORIGIN'):
+                origin = line.split()[1].rstrip('.').lower()
+                continue
+            if line.startswith('$'):
+                continue
+            # 공백으로 시작하는 줄은 이전 레코드의 소유자를 그대로 사용
+            if not line[0].isspace():
+                name = line.split()[0]
+                if name == '@':
+                    owner = origin
+                elif name.endswith('.'):
+                    owner = name.rstrip('.').lower()
+                else:
+                    owner = f"{name.lower()}.{origin}"
+            yield owner
+
+    async def fetch(self, session, domain):
+        text = await asyncio.to_thread(read_text, self.path)
+        for name in dict.fromkeys(self.owner_names(text, domain)):
+            name = name[2:] if name.startswith('*.') else name
+            if name.endswith(f".{domain}"):
+                yield name
+
+
+# 출처 이름 -> 출처 객체
+SOURCES = {}
+
+
+def register_source(source):
+    SOURCES[source.name] = source
+    return source
+
+
+def enabled_sources(names=SUBDOMAIN_SOURCES):
+    return {name: SOURCES[name] for name in (n.strip() for n in names.split(',')) if name in SOURCES}
+
+
+for source in (CrtShSource(), VirusTotalSource(), HackerTargetSource(), ThreatCrowdSource()):
+    register_source(source)
+if SUBDOMAIN_FIXTURE_FILE:
+    register_source(FixtureSource(SUBDOMAIN_FIXTURE_FILE))
+if SUBDOMAIN_ZONE_FILE:
+    register_source(ZoneFileSource(SUBDOMAIN_ZONE_FILE))
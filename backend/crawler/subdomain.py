@@ -3,148 +3,183 @@ import aiohttp
 import sys
 import re
 import json
-import ssl
-import tldextract
 from urllib.parse import urlparse
+from backend.crawler.http_client import http_client
+from backend.crawler.discovery_cache import discovery_cache
+from backend.crawler.sources import enabled_sources
+from backend.crawler.bruteforce import DNSBruteForcer
+from backend.crawler.publicsuffix import registered_domain, strip_url
+from backend.config import SUBDOMAIN_SCAN_DEADLINE, SUBDOMAIN_ACTIVE_SCAN
 
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
+# 메일 관련 서브 도메인은 웹 자산이 아니므로 제외
+EMAIL_RELATED_LABELS = frozenset(['mail', 'email', 'smtp', 'pop', 'imap', 'webmail'])
+
+# 백그라운드 캐시 갱신 작업 (GC되지 않도록 참조 유지) 과 갱신 중인 도메인
+background_tasks = set()
+refreshing_domains = set()
+
 class SubdomainScanner:
-    def __init__(self, domain):
+    def __init__(self, domain, sources=None, deadline=SUBDOMAIN_SCAN_DEADLINE, active=SUBDOMAIN_ACTIVE_SCAN == "true"):
         self.domain = self.normalize_domain(domain)
+        self.subdomain_pattern = re.compile(r'^([a-z0-9-]{1,50})\.%s$' % re.escape(self.domain), re.MULTILINE)
         self.subdomains = set()
-        self.session = None
+        self.sources = {}
+        # 출처 이름 -> SubdomainSource (지정하지 않으면 설정에서 켜진 출처 사용)
+        self.registry = {source.name: source for source in sources} if sources is not None else enabled_sources()
+        # 출처 이름 -> 신뢰도 (패시브 출처 + 실행한 경우 DNS 브루트포스)
+        self.source_confidence = {name: source.confidence for name, source in self.registry.items()}
+        self.deadline = deadline
+        # 패시브 출처 조회 후 DNS 브루트포스(단어 목록 + 변형)를 추가로 실행할지 여부
+        self.active = active
 
     def normalize_domain(self, domain):
-        # Remove protocol if present
-        domain = re.sub(r'^https?://', '', domain)
-        # Remove trailing slash if present
-        domain = domain.rstrip('/')
-        # Extract the main domain
-        parts = domain.split('.')
-        if len(parts) > 2:
-            domain = '.'.join(parts[-2:])
-        return domain
+        # URL이면 호스트만 남기고, Public Suffix List 기준 등록 도메인으로 변환 (www.example.co.kr -> example.co.kr)
+        host = strip_url(domain)
+        return registered_domain(host) or host
+
+    def filter_subdomains(self, hostnames):
+        """
+        수집한 호스트 이름 전체를 한 번에 검사해 유효한 서브 도메인만 정렬해서 반환한다.
+        self.domain이 등록 도메인이므로 "<라벨>.<self.domain>" 형태만 남기면 되고,
+        이름들을 줄바꿈으로 이어 정규식 한 번으로 걸러낸다.
+        - 서브 도메인 라벨은 영문/숫자/하이픈 1~50자 (IP, 이메일 주소, 다단계 라벨 제외)
+        - 숫자로만 된 라벨과 메일 관련 라벨 제외
+        """
+        if not hostnames:
+            return []
+        text = '\n'.join(hostnames).lower()
+        labels = self.subdomain_pattern.findall(text)
+        return sorted(
+            f"{label}.{self.domain}"
+            for label in set(labels)
+            if not label.isdigit() and label not in EMAIL_RELATED_LABELS
+        )
 
     def is_valid_subdomain(self, subdomain):
-        # Check if subdomain is not just an IP address
-        if re.match(r'^\d+\.\d+\.\d+\.\d+$', subdomain):
-            return False
-        # Check if subdomain ends with the main domain
-        if not subdomain.endswith(self.domain):
-            return False
-        # Check if subdomain has at least one additional level
-        if subdomain == self.domain:
-            return False
-        return True
-    
-    def is_valid_subdomain(self, subdomain):
-        # TLD 추출을 위해 tldextract 사용
-        ext = tldextract.extract(subdomain)
-        
-        # 메인 도메인과 일치하는지 확인
-        if ext.domain != self.domain.split('.')[0] or ext.suffix != self.domain.split('.')[1]:
-            return False
-        
-        # 서브도메인이 비어있으면 제외 (메인 도메인만 있는 경우)
-        if not ext.subdomain:
-            return False
-        
-        # 이메일 주소 형식 제외
-        if '@' in subdomain:
-            return False
-        
-        # 일반적인 이메일 관련 서브도메인 제외
-        email_related = ['mail', 'email', 'smtp', 'pop', 'imap', 'webmail']
-        if ext.subdomain in email_related:
-            return False
-        
-        # 숫자로만 이루어진 서브도메인 제외
-        if ext.subdomain.isdigit():
-            return False
-        
-        # 특수문자가 포함된 서브도메인 제외 (하이픈 제외)
-        if re.search(r'[^a-zA-Z0-9-]', ext.subdomain):
-            return False
-        
-        # 길이가 너무 긴 서브도메인 제외 (예: 50자 이상)
-        if len(ext.subdomain) > 50:
-            return False
+        return bool(self.filter_subdomains([subdomain]))
+
+    def add_subdomains(self, source, subdomains):
+        for subdomain in subdomains:
+            self.subdomains.add(subdomain)
+            self.sources.setdefault(subdomain, set()).add(source)
+
+    def confidence(self, subdomain):
+        missing = 1.0
+        for name in self.sources.get(subdomain, ()):
+            missing *= 1.0 - self.source_confidence.get(name, 0.5)
+        return 1.0 - missing
+
+    async def run_source(self, source, queue):
+        # 성공하고 결과가 있는 경우에만 캐시에 저장
+        # (실패하거나 오류 본문을 200으로 돌려준 출처가 기존 결과를 지우지 않도록)
+        # 마감 후 백그라운드로 넘어가도 계속 쓸 수 있도록 세션은 출처마다 따로 열고 작업이 끝날 때 닫음
+        found = set()
+        try:
+            async with http_client.session_scope() as session:
+                async for subdomain in source.fetch(session, self.domain):
+                    if subdomain not in found:
+                        found.add(subdomain)
+                        queue.put_nowait((source.name, subdomain))
+            if not found:
+                print(f"No subdomains from {source.name}, keeping cached results")
+            elif source.cacheable:
+                await discovery_cache.save(self.domain, source.name, found)
+        except Exception as e:
+            print(f"Error fetching subdomains from {source.name}: {e}")
+        finally:
+            queue.put_nowait((source.name, None))
 
-        return True
+    async def stream_sources(self, names, deadline=None):
+        """
+        여러 출처를 동시에 조회하면서 (출처 이름, 서브 도메인)을 찾는 즉시 내보낸다.
+        deadline이 지나면 지금까지 모은 결과만으로 끝내고, 남은 출처는 공유 세션이 있으면
+        (각자 연 세션으로) 백그라운드에서 계속 실행해 캐시를 채우고 없으면 취소한다.
+        """
+        queue = asyncio.Queue()
+        tasks = [asyncio.create_task(self.run_source(self.registry[name], queue)) for name in names]
+        remaining = len(tasks)
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + deadline if deadline else None
+        try:
+            while remaining:
+                timeout = None if deadline_at is None else deadline_at - loop.time()
+                try:
+                    source, subdomain = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    print(f"Subdomain scan deadline reached for {self.domain}, returning partial results")
+                    break
+                if subdomain is None:
+                    remaining -= 1
+                else:
+                    yield source, subdomain
+        finally:
+            for task in tasks:
+                if task.done():
+                    continue
+                if http_client.is_running:
+                    background_tasks.add(task)
+                    task.add_done_callback(background_tasks.discard)
+                else:
+                    task.cancel()
+
+    async def refresh_sources(self, sources):
+        async for _ in self.stream_sources(sources, self.deadline):
+            pass
+
+    def schedule_refresh(self, sources):
+        if not sources or self.domain in refreshing_domains:
+            return
+        refreshing_domains.add(self.domain)
+
+        async def refresh():
+            try:
+                await SubdomainScanner(self.domain, self.registry.values(), self.deadline).refresh_sources(sources)
+                print(f"Refreshed subdomain sources for {self.domain}: {', '.join(sources)}")
+            finally:
+                refreshing_domains.discard(self.domain)
+
+        task = asyncio.create_task(refresh())
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+    async def active_scan(self, bruteforcer=None):
+        # 패시브 출처에서 찾은 서브 도메인을 변형 후보의 재료로 사용
+        bruteforcer = bruteforcer or DNSBruteForcer(self.domain)
+        self.source_confidence[bruteforcer.name] = bruteforcer.confidence
+        found = await bruteforcer.run(self.subdomains)
+        self.add_subdomains(bruteforcer.name, found)
 
     async def scan(self):
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        conn = aiohttp.TCPConnector(ssl=ssl_context)
-        async with aiohttp.ClientSession(connector=conn) as self.session:
-            await asyncio.gather(
-                self.search_crt_sh(),
-                self.search_virustotal(),
-                self.search_hackertarget(),
-                self.search_threatcrowd(),
-            )
+        cached = await discovery_cache.load(self.domain)
+        missing, stale = [], []
+        for source in self.registry:
+            entry = cached.get(source)
+            if entry is None:
+                missing.append(source)
+                continue
+            self.add_subdomains(source, entry['subdomains'])
+            if not discovery_cache.is_fresh(entry):
+                stale.append(source)
+
+        # 캐시에 없는 출처만 지금 조회하고, 오래된 출처는 캐시 결과를 먼저 돌려준 뒤 백그라운드에서 갱신
+        if missing:
+            async for source, subdomain in self.stream_sources(missing, self.deadline):
+                self.add_subdomains(source, (subdomain,))
+        self.schedule_refresh(stale)
+
+        if self.active:
+            await self.active_scan()
+
         raw_subdomains = list(self.subdomains)
-        filtered_subdomains = list(filter(self.is_valid_subdomain, raw_subdomains))
+        filtered_subdomains = self.filter_subdomains(raw_subdomains)
         
-        print(f"Total subdomains found: {len(raw_subdomains)}")
+        print(f"Total subdomains found: {len(raw_subdomains)} (cached sources: {len(cached)}, stale: {len(stale)})")
         print(f"Valid subdomains after filtering: {len(filtered_subdomains)}")
         
-        return sorted(filtered_subdomains)
-
-    async def make_request(self, url, max_retries=3):
-        for _ in range(max_retries):
-            try:
-                async with self.session.get(url, timeout=30) as response:
-                    if response.status == 200:
-                        return await response.text()
-            except Exception as e:
-                print(f"Error connecting to {url}: {e}")
-                await asyncio.sleep(1)
-        return None
-
-    async def search_crt_sh(self):
-        url = f"https://crt.sh/?q=%.{self.domain}&output=json"
-        response = await self.make_request(url)
-        if response:
-            try:
-                data = json.loads(response)
-                for entry in data:
-                    self.subdomains.add(entry['name_value'].lower())
-            except json.JSONDecodeError:
-                print("Error decoding JSON from crt.sh")
-
-    async def search_virustotal(self):
-        url = f"https://www.virustotal.com/ui/domains/{self.domain}/subdomains"
-        response = await self.make_request(url)
-        if response:
-            try:
-                data = json.loads(response)
-                for item in data.get('data', []):
-                    if 'id' in item:
-                        self.subdomains.add(item['id'].lower())
-            except json.JSONDecodeError:
-                print("Error decoding JSON from VirusTotal")
-
-    async def search_hackertarget(self):
-        url = f"https://api.hackertarget.com/hostsearch/?q={self.domain}"
-        response = await self.make_request(url)
-        if response:
-            subdomains = re.findall(r'(.*?)\,', response)
-            self.subdomains.update(map(str.lower, subdomains))
-
-    async def search_threatcrowd(self):
-        url = f"https://www.threatcrowd.org/searchApi/v2/domain/report/?domain={self.domain}"
-        response = await self.make_request(url)
-        if response:
-            try:
-                data = json.loads(response)
-                for subdomain in data.get('subdomains', []):
-                    self.subdomains.add(subdomain.lower())
-            except json.JSONDecodeError:
-                print("Error decoding JSON from ThreatCrowd")
+        return filtered_subdomains
 
 async def main():
     domain = input("Enter the domain to scan for subdomains: ")
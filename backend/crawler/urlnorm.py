@@ -0,0 +1,47 @@
+from urllib.parse import urlparse, urlunparse, unquote_plus
+
+# 같은 페이지를 다른 URL로 보이게 만드는 광고/분석용 파라미터
+TRACKING_PARAMS = frozenset([
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', '_hsenc', '_hsmi', 'ref_src', 'spm', 'n_media', 'n_query', 'n_rank',
+])
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def is_tracking_param(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def query_param_name(piece):
+    return unquote_plus(piece.split('=', 1)[0])
+
+
+def canonicalize_url(url):
+    """
+    같은 페이지를 가리키는 URL을 하나의 형태로 맞춘다.
+    - 스킴/호스트 소문자, 기본 포트 제거, 빈 경로는 '/' (사용자 정보와 IPv6 대괄호는 그대로 유지)
+    - fragment(#...) 제거
+    - 추적용 파라미터(utm_*, gclid 등) 제거 후 나머지 쿼리 파라미터를 이름 순으로 정렬
+      (원래의 "이름=값" 조각을 그대로 사용해 ?a 와 ?a= , %2F 와 / 처럼 의미가 다를 수 있는 표기를 바꾸지 않음)
+    """
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+
+    userinfo, _, hostport = parsed.netloc.rpartition('@')
+    hostport = hostport.lower()
+    default_port = DEFAULT_PORTS.get(scheme)
+    if default_port is not None and hostport.endswith(f":{default_port}"):
+        hostport = hostport[:-len(f":{default_port}")]
+    hostport = hostport.rstrip(':')
+    netloc = f"{userinfo}@{hostport}" if userinfo else hostport
+
+    pieces = [
+        piece for piece in parsed.query.split('&')
+        if piece and not is_tracking_param(query_param_name(piece))
+    ]
+    # 같은 이름의 파라미터는 원래 순서를 유지 (정렬은 안정 정렬)
+    query = '&'.join(sorted(pieces, key=query_param_name))
+    return urlunparse((scheme, netloc, parsed.path or '/', parsed.params, query, ''))
@@ -1,19 +1,102 @@
-import requests
+import asyncio
+import time
+import aiohttp
+from backend.config import (
+    VALIDATE_URL_CONNECT_TIMEOUT,
+    VALIDATE_URL_READ_TIMEOUT,
+    VALIDATE_URL_CACHE_TTL,
+    VALIDATE_URL_NEGATIVE_CACHE_TTL,
+)
+from backend.crawler.http_client import http_client
 
-def validate_url(url: str) -> dict:
-    try:
-        response = requests.get(url)
-        
-        if response.status_code == 200:
+# 캐시 항목이 이 수를 넘으면 만료된 항목을 정리
+MAX_CACHE_ENTRIES = 1000
+
+
+class URLValidator:
+    """
+    이벤트 루프를 막지 않는 URL 유효성 검사.
+    HEAD 요청을 먼저 보내고, HEAD를 지원하지 않는 서버에는 GET으로 다시 확인하며 본문은 읽지 않는다.
+    결과는 URL별로 짧은 시간 캐시해 UI에서 같은 주소를 반복 검사해도 바로 응답한다.
+    """
+
+    def __init__(
+        self,
+        connect_timeout=VALIDATE_URL_CONNECT_TIMEOUT,
+        read_timeout=VALIDATE_URL_READ_TIMEOUT,
+        ttl=VALIDATE_URL_CACHE_TTL,
+        negative_ttl=VALIDATE_URL_NEGATIVE_CACHE_TTL,
+    ):
+        self.timeout = aiohttp.ClientTimeout(
+            total=connect_timeout + read_timeout, sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # url -> (만료 시각, 결과)
+        self.cache = {}
+        # 같은 URL에 대한 동시 검사는 하나로 합침
+        self.pending = {}
+
+    async def status(self, session, method, url):
+        async with session.request(method, url, timeout=self.timeout, allow_redirects=True) as response:
+            # 본문을 읽지 않고 연결을 닫음
+            response.close()
+            return response.status
+
+    async def check(self, url):
+        try:
+            async with http_client.session_scope() as session:
+                status = await self.status(session, 'HEAD', url)
+                if status != 200:
+                    status = await self.status(session, 'GET', url)
+        except aiohttp.InvalidURL:
+            return {"valid": False, "error": f"Invalid URL '{url}'"}
+        except asyncio.TimeoutError:
+            return {"valid": False, "error": f"Timed out connecting to {url}"}
+        except (aiohttp.ClientError, ValueError) as e:
+            return {"valid": False, "error": str(e) or type(e).__name__}
+
+        if status == 200:
             return {"valid": True}
-        else:
-            return {
-                "valid": False,
-                "error": f"Received status code {response.status_code}"
-            }
-    
-    except requests.RequestException as e:
-        return {
-            "valid": False,
-            "error": str(e)
-        }
+        return {"valid": False, "error": f"Received status code {status}"}
+
+    def cached(self, url):
+        entry = self.cache.get(url)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self.cache[url]
+            return None
+        return result
+
+    def store(self, url, result):
+        now = time.monotonic()
+        if len(self.cache) >= MAX_CACHE_ENTRIES:
+            for key in [key for key, (expires_at, _) in self.cache.items() if expires_at < now]:
+                del self.cache[key]
+        ttl = self.ttl if result["valid"] else self.negative_ttl
+        self.cache[url] = (now + ttl, result)
+
+    async def check_and_store(self, url):
+        result = await self.check(url)
+        self.store(url, result)
+        return result
+
+    async def validate(self, url):
+        url = url.strip()
+        result = self.cached(url)
+        if result is not None:
+            return dict(result)
+
+        if url not in self.pending:
+            self.pending[url] = asyncio.ensure_future(self.check_and_store(url))
+            self.pending[url].add_done_callback(lambda _: self.pending.pop(url, None))
+        return dict(await asyncio.shield(self.pending[url]))
+
+
+url_validator = URLValidator()
+
+
+async def validate_url(url: str) -> dict:
+    return await url_validator.validate(url)
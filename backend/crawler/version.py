@@ -1,14 +1,20 @@
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
 import json
 import re
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 import logging
 import sys
 import hashlib
 import struct
-import socket
+from contextlib import asynccontextmanager
+from backend.crawler.myparser import Parser
+from backend.crawler.resolver import resolver
+from backend.crawler.http_client import http_client
+from backend.crawler.signatures import SERVER_SIGNATURES, ERROR_SIGNATURES, SCRIPT_SIGNATURES
+from backend.crawler.script_cache import script_cache, content_hash
+from backend.crawler.site_files import site_files
+from backend.config import ANALYZER_MAX_CONCURRENCY, ANALYZER_REQUEST_TIMEOUT, ANALYZER_DEADLINE
 
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -17,32 +23,56 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 class AdvancedWebAnalyzer:
-    def __init__(self, url):
+    def __init__(
+        self,
+        url,
+        max_concurrency=ANALYZER_MAX_CONCURRENCY,
+        request_timeout=ANALYZER_REQUEST_TIMEOUT,
+        deadline=ANALYZER_DEADLINE,
+    ):
         self.url = url if url.startswith(('http://', 'https://')) else f'https://{url}'
         self.results = {'server': {}, 'os': None, 'technologies': [], 'frameworks': []}
         self.ip = None
+        # 분석기 하나가 동시에 보내는 요청 수, 요청별 타임아웃, 전체 분석 제한 시간
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.request_timeout = request_timeout
+        self.deadline = deadline
+
+    @asynccontextmanager
+    async def request(self, session, url, **kwargs):
+        async with self.semaphore:
+            timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+            async with session.get(url, timeout=timeout, **kwargs) as response:
+                yield response
 
     async def analyze(self):
-        try:
-            self.ip = socket.gethostbyname(self.url.split('//')[1].split('/')[0])
-        except Exception as e:
-            logger.error(f"Error resolving IP: {e}")
+        host = urlparse(self.url).hostname
+        self.ip = await resolver.resolve(host) if host else None
+        if self.ip is None:
+            logger.error(f"Error resolving IP: {host}")
             return self.results
 
-        async with aiohttp.ClientSession() as session:
-            await asyncio.gather(
-                self.analyze_http_response(session),
-                self.analyze_error_pages(session),
-                self.analyze_dynamic_content(session),
-                self.analyze_static_files(session),
-                self.analyze_tcp_ip()
-            )
+        async with http_client.session_scope() as session:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        self.analyze_http_response(session),
+                        self.analyze_error_pages(session),
+                        self.analyze_dynamic_content(session),
+                        self.analyze_static_files(session),
+                        self.analyze_tcp_ip()
+                    ),
+                    timeout=self.deadline,
+                )
+            except asyncio.TimeoutError:
+                # 제한 시간 안에 끝나지 않은 분석은 취소하고 지금까지의 결과만 사용
+                logger.warning(f"Analysis of {self.url} exceeded {self.deadline}s; returning partial results")
         self.remove_duplicates()
         return self.results
 
     async def analyze_http_response(self, session):
         try:
-            async with session.get(self.url) as response:
+            async with self.request(session, self.url) as response:
                 headers = response.headers
                 self.analyze_server_header(headers)
                 self.analyze_other_headers(headers)
@@ -55,25 +85,7 @@ class AdvancedWebAnalyzer:
         server_header = headers.get('Server', '')
         self.results['server']['name'] = server_header
 
-        server_patterns = {
-            'nginx': r'nginx(?:/(\d+\.\d+\.\d+))?',
-            'apache': r'Apache(?:/(\d+\.\d+\.\d+))?',
-            'iis': r'Microsoft-IIS(?:/(\d+\.\d+))?',
-            'lighttpd': r'lighttpd(?:/(\d+\.\d+\.\d+))?',
-            'openresty': r'openresty(?:/(\d+\.\d+\.\d+))?',
-            'tomcat': r'Apache-Coyote(?:/(\d+\.\d+))?',
-            'node.js': r'Node\.js',
-            'gunicorn': r'gunicorn(?:/(\d+\.\d+\.\d+))?',
-            'caddy': r'Caddy',
-        }
-
-        for server, pattern in server_patterns.items():
-            match = re.search(pattern, server_header, re.IGNORECASE)
-            if match:
-                self.results['server']['type'] = server
-                if match.group(1):
-                    self.results['server']['version'] = match.group(1)
-                break
+        self.apply_signature_hits(SERVER_SIGNATURES.scan(server_header)[:1])
 
     def analyze_other_headers(self, headers):
         header_indicators = {
@@ -117,37 +129,19 @@ class AdvancedWebAnalyzer:
 
     async def analyze_error_pages(self, session):
         error_paths = ['/nonexistent', '/admin', '/login', '/api']
-        for path in error_paths:
-            try:
-                async with session.get(urljoin(self.url, path), allow_redirects=False) as response:
-                    if response.status != 200:
-                        content = await response.text()
-                        self.analyze_error_content(content)
-            except Exception as e:
-                logger.error(f"Error analyzing error page {path}: {e}")
+        await asyncio.gather(*(self.analyze_error_page(session, path) for path in error_paths))
 
-    def analyze_error_content(self, content):
-        error_patterns = {
-            'nginx': r'nginx/(\d+\.\d+\.\d+)',
-            'apache': r'Apache/(\d+\.\d+\.\d+)',
-            'iis': r'Microsoft-IIS/(\d+\.\d+)',
-            'php': r'PHP/(\d+\.\d+\.\d+)',
-            'tomcat': r'Apache Tomcat/(\d+\.\d+\.\d+)',
-            'django': r'Django',
-            'laravel': r'Laravel',
-            'symfony': r'Symfony',
-        }
+    async def analyze_error_page(self, session, path):
+        try:
+            async with self.request(session, urljoin(self.url, path), allow_redirects=False) as response:
+                if response.status != 200:
+                    content = await response.text()
+                    self.analyze_error_content(content)
+        except Exception as e:
+            logger.error(f"Error analyzing error page {path}: {e}")
 
-        for tech, pattern in error_patterns.items():
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                if tech in ['nginx', 'apache', 'iis', 'tomcat']:
-                    self.results['server']['type'] = tech
-                    self.results['server']['version'] = match.group(1)
-                elif tech == 'php':
-                    self.results['technologies'].append(f"PHP {match.group(1)}")
-                else:
-                    self.results['frameworks'].append(tech)
+    def analyze_error_content(self, content):
+        self.apply_signature_hits(ERROR_SIGNATURES.scan(content))
 
         # OS detection from error pages
         if 'windows' in content.lower():
@@ -157,43 +151,80 @@ class AdvancedWebAnalyzer:
 
     async def analyze_dynamic_content(self, session):
         try:
-            async with session.get(self.url) as response:
+            async with self.request(session, self.url) as response:
                 content = await response.text()
-                soup = BeautifulSoup(content, 'html.parser')
 
-                self.analyze_meta_tags(soup)
-                await self.analyze_script_tags(soup, session)
-                self.analyze_link_tags(soup)
-                self.analyze_inline_styles(soup)
-                self.analyze_html_structure(soup)
+            document = Parser.parse(content)
+
+            self.analyze_meta_tags(document)
+            await self.analyze_script_tags(document, session)
+            self.analyze_link_tags(document)
+            self.analyze_inline_styles(document)
+            self.analyze_html_structure(document)
 
         except Exception as e:
             logger.error(f"Error in dynamic content analysis: {e}")
 
-    def analyze_meta_tags(self, soup):
+    def analyze_meta_tags(self, document):
         meta_indicators = {
             'generator': lambda v: self.results['technologies'].append(v),
             'application-name': lambda v: self.results['technologies'].append(v),
         }
 
-        for tag in soup.find_all('meta'):
-            name = tag.get('name', '').lower()
-            content = tag.get('content', '')
+        for tag in document.meta:
+            name = tag['name'].lower()
+            content = tag['content']
             if name in meta_indicators and content:
                 meta_indicators[name](content)
 
-    async def analyze_script_tags(self, soup, session):
-        for script in soup.find_all('script'):
-            if script.get('src'):
-                await self.analyze_external_script(session, script['src'])
+    async def analyze_script_tags(self, document, session):
+        external_scripts = []
+        for script in document.scripts:
+            if script['src']:
+                external_scripts.append(self.analyze_external_script(session, script['src']))
             else:
-                self.analyze_inline_script(script.string)
+                self.analyze_inline_script(script['content'])
+        await asyncio.gather(*external_scripts)
 
     async def analyze_external_script(self, session, src):
+        script_url = urljoin(self.url, src)
         try:
-            async with session.get(urljoin(self.url, src)) as response:
-                script_content = await response.text()
-                self.analyze_script_content(script_content)
+            # 최근에 분석한 URL이면 요청 없이 캐시된 결과 사용
+            cached = await script_cache.get_url(script_url)
+            if cached and script_cache.is_fresh(cached):
+                self.apply_signature_hits(cached['hits'])
+                return
+
+            headers = {}
+            if cached and cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached and cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+            async with self.request(session, script_url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    await script_cache.touch_url(script_url, cached)
+                    self.apply_signature_hits(cached['hits'])
+                    return
+                if response.status != 200:
+                    # 오류 페이지(404, 429, 5xx)의 내용은 분석하지도, 캐시에 덮어쓰지도 않음
+                    logger.info(f"Skipping external script {script_url}: HTTP {response.status}")
+                    return
+                body = await response.read()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                encoding = response.get_encoding()
+
+            # 다른 URL에서 같은 내용을 이미 분석했다면 정규식 분석 생략
+            digest = content_hash(body)
+            by_hash = await script_cache.get_hash(digest)
+            if by_hash is not None:
+                hits = by_hash['hits']
+            else:
+                hits = SCRIPT_SIGNATURES.scan(body.decode(encoding, errors='replace'))
+
+            await script_cache.put_result(script_url, digest, hits, etag=etag, last_modified=last_modified)
+            self.apply_signature_hits(hits)
         except Exception as e:
             logger.error(f"Error analyzing external script {src}: {e}")
 
@@ -202,45 +233,26 @@ class AdvancedWebAnalyzer:
             self.analyze_script_content(content)
 
     def analyze_script_content(self, content):
-        framework_patterns = {
-            'React': r'(?:React\.|ReactDOM\.|jsx)',
-            'Vue.js': r'(?:Vue\.|Vuex\.|v-bind:|v-on:)',
-            'Angular': r'(?:angular\.|ng-app|ng-controller)',
-            'jQuery': r'(?:\$\(|jQuery\()',
-            'Lodash': r'_\.',
-            'Moment.js': r'moment\(',
-            'Axios': r'axios\.',
-            'D3.js': r'd3\.',
-            'Backbone.js': r'Backbone\.',
-            'Ember.js': r'Ember\.',
-            'Svelte': r'svelte\.',
-            'Next.js': r'next/|useRouter\(\)',
-            'Nuxt.js': r'nuxt\.|useNuxt\(\)',
-            'Alpine.js': r'x-data|x-bind',
-            'Meteor': r'Meteor\.',
-            'Polymer': r'Polymer\(',
-        }
-
-        for framework, pattern in framework_patterns.items():
-            if re.search(pattern, content):
-                self.results['frameworks'].append(framework)
-
-        version_patterns = {
-            'React': r'React\.version\s*=\s*[\'"](\d+\.\d+\.\d+)[\'"]',
-            'Vue.js': r'Vue\.version\s*=\s*[\'"](\d+\.\d+\.\d+)[\'"]',
-            'Angular': r'angular\.version\.full\s*=\s*[\'"](\d+\.\d+\.\d+)[\'"]',
-            'jQuery': r'jQuery\.fn\.jquery\s*=\s*[\'"](\d+\.\d+\.\d+)[\'"]',
-        }
-
-        for framework, pattern in version_patterns.items():
-            match = re.search(pattern, content)
-            if match:
-                self.results['frameworks'].append(f"{framework} {match.group(1)}")
+        self.apply_signature_hits(SCRIPT_SIGNATURES.scan(content))
+
+    def apply_signature_hits(self, hits):
+        for hit in hits:
+            version = hit['groups'][0] if hit['groups'] else None
+            if hit['kind'] == 'server':
+                self.results['server']['type'] = hit['name']
+                if version:
+                    self.results['server']['version'] = version
+            elif hit['kind'] == 'technology':
+                self.results['technologies'].append(f"{hit['label']} {version}" if version else hit['label'])
+            elif hit['kind'] == 'framework_version':
+                self.results['frameworks'].append(f"{hit['label']} {version}")
+            else:
+                self.results['frameworks'].append(hit['label'])
 
-    def analyze_link_tags(self, soup):
-        for link in soup.find_all('link'):
-            href = link.get('href', '')
-            rel = link.get('rel', [])
+    def analyze_link_tags(self, document):
+        for link in document.link_tags:
+            href = link['href']
+            rel = link['rel']
             
             if 'stylesheet' in rel:
                 if 'bootstrap' in href:
@@ -252,22 +264,21 @@ class AdvancedWebAnalyzer:
                 elif 'bulma' in href:
                     self.results['frameworks'].append('Bulma')
 
-    def analyze_inline_styles(self, soup):
-        inline_styles = soup.find_all('style')
-        for style in inline_styles:
-            content = style.string
+    def analyze_inline_styles(self, document):
+        for content in document.styles:
             if content:
                 if re.search(r'\.col-[sm|md|lg|xl]', content):
                     self.results['frameworks'].append('Bootstrap (probable)')
                 elif re.search(r'\.pure-', content):
                     self.results['frameworks'].append('Pure.css')
 
-    def analyze_html_structure(self, soup):
-        if soup.select('[ng-app]') or soup.select('[ng-controller]'):
+    def analyze_html_structure(self, document):
+        attributes = document.attributes
+        if 'ng-app' in attributes or 'ng-controller' in attributes:
             self.results['frameworks'].append('Angular.js')
-        if soup.select('[v-app]') or soup.select('[v-bind]'):
+        if 'v-app' in attributes or 'v-bind' in attributes:
             self.results['frameworks'].append('Vue.js')
-        if soup.select('[data-reactroot]') or soup.select('[data-reactid]'):
+        if 'data-reactroot' in attributes or 'data-reactid' in attributes:
             self.results['frameworks'].append('React')
 
     async def analyze_static_files(self, session):
@@ -279,14 +290,18 @@ class AdvancedWebAnalyzer:
             '/ads.txt',
         ]
 
-        for path in common_paths:
-            try:
-                async with session.get(urljoin(self.url, path)) as response:
-                    if response.status == 200:
-                        content = await response.read()
-                        self.analyze_static_file_content(path, content)
-            except Exception as e:
-                logger.error(f"Error analyzing static file {path}: {e}")
+        await asyncio.gather(*(self.analyze_static_file(session, path) for path in common_paths))
+
+    async def analyze_static_file(self, session, path):
+        # robots.txt, sitemap.xml 등은 디렉토리 크롤러와 같은 캐시를 통해 한 번만 받음
+        # 한 파일의 오류가 gather로 묶인 다른 파일 분석을 멈추지 않도록 파일마다 처리
+        try:
+            async with self.semaphore:
+                content = await site_files.fetch(session, urljoin(self.url, path), self.request_timeout)
+            if content is not None:
+                self.analyze_static_file_content(path, content)
+        except Exception as e:
+            logger.error(f"Error analyzing static file {path}: {e}")
 
     def analyze_static_file_content(self, path, content):
         if path == '/favicon.ico':
@@ -307,14 +322,16 @@ class AdvancedWebAnalyzer:
 
     async def analyze_tcp_ip(self):
         try:
-            reader, writer = await asyncio.open_connection(self.ip, 80)
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.ip, 80), timeout=self.request_timeout
+            )
             
             # Send a minimal HTTP request
             writer.write(b"GET / HTTP/1.0\r\nHost: " + self.url.encode() + b"\r\n\r\n")
             await writer.drain()
 
             # Read the response
-            data = await reader.read(4096)
+            data = await asyncio.wait_for(reader.read(4096), timeout=self.request_timeout)
             writer.close()
             await writer.wait_closed()
 
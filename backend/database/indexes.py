@@ -0,0 +1,109 @@
+import logging
+import sys
+from datetime import datetime, timezone
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError, ServerSelectionTimeoutError
+from backend.config import SUBDOMAIN_CACHE_EXPIRE_SECONDS
+from backend.database.mongodb import db
+
+logger = logging.getLogger(__name__)
+
+# 컬렉션 이름 -> [(키 목록, create_index 옵션)], 인덱스 이름은 기존 인덱스와 겹치지 않도록 MongoDB 기본값(필드_1)을 사용
+# 서버 시작 시 ensure_indexes()가 모두 만들고, 캐시처럼 따로 쓰이는 컬렉션은 처음 사용할 때 create_indexes()로 만든다.
+INDEXES = {
+    "cve": [
+        # CVE 매칭은 메모리 색인(cve_index)에서 하므로, DB에서는 피드 적재 시 upsert 조건만 색인
+        ([("cve number", ASCENDING), ("endpoint", ASCENDING)], {"unique": True}),
+    ],
+    "history": [
+        ([("user_id", ASCENDING)], {"unique": True}),
+    ],
+    "contact": [
+        # 관리자 화면은 읽지 않은 문의만 조회하므로 그 문서만 색인
+        ([("is_read", ASCENDING)], {"partialFilterExpression": {"is_read": False}}),
+    ],
+    "script_cache": [
+        ([("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ],
+    "subdomain_cache": [
+        ([("domain", ASCENDING)], {}),
+        ([("fetched_at", ASCENDING)], {"expireAfterSeconds": SUBDOMAIN_CACHE_EXPIRE_SECONDS}),
+    ],
+}
+
+
+def create_indexes(collection, name=None):
+    """name(기본값: 컬렉션 이름)에 등록된 인덱스를 만든다. 이미 있으면 MongoDB가 그대로 둔다."""
+    for keys, options in INDEXES.get(name or collection.name, ()):
+        collection.create_index(keys, **options)
+
+
+def ensure_indexes(database=None):
+    database = db if database is None else database
+    created = []
+    for name in INDEXES:
+        try:
+            create_indexes(database.get_collection(name))
+            created.append(name)
+        except ServerSelectionTimeoutError as e:
+            # DB에 연결할 수 없으면 나머지 컬렉션도 실패하므로 바로 중단
+            logger.error(f"MongoDB unavailable, skipping index creation: {e}")
+            break
+        except PyMongoError as e:
+            # 기존 데이터에 중복 user_id가 있는 경우 등, 한 컬렉션의 실패가 서버 시작을 막지 않도록 기록만 함
+            logger.error(f"Error creating indexes for {name}: {e}")
+    logger.info(f"MongoDB indexes ensured for: {', '.join(created)}")
+    return created
+
+
+def hot_queries():
+    """자주 실행되는 조회 [(컬렉션 이름, 조건)]. 시각이 들어가는 조건이 있으므로 확인할 때마다 만든다."""
+    return [
+        ("cve", {"cve number": "CVE-2020-11022", "endpoint": "text"}),
+        ("history", {"user_id": "root"}),
+        ("history", {"user_id": "root", "histories._id": "history-id"}),
+        ("contact", {"is_read": False}),
+        ("script_cache", {"_id": "url:https://example.com/app.js", "expires_at": {"$gt": datetime.now(timezone.utc)}}),
+        ("subdomain_cache", {"domain": "example.com"}),
+    ]
+
+
+def plan_stages(plan):
+    # 실행 계획 트리(inputStage, inputStages, queryPlan 등)의 모든 stage 이름
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from plan_stages(value)
+
+
+def check_query_plans(database=None):
+    """COLLSCAN으로 실행되는 조회 목록 [(컬렉션 이름, 조건)]을 반환한다. 비어 있으면 모든 조회가 인덱스를 사용한다."""
+    database = db if database is None else database
+    failures = []
+    for name, query in hot_queries():
+        explain = database.get_collection(name).find(query).explain()
+        if "COLLSCAN" in set(plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))):
+            failures.append((name, query))
+    return failures
+
+
+def main():
+    ensure_indexes()
+    if "--check" not in sys.argv:
+        return
+    failures = check_query_plans()
+    for name, query in failures:
+        print(f"COLLSCAN: {name} {query}")
+    if failures:
+        sys.exit(1)
+    print("All hot queries use an index.")
+
+
+if __name__ == "__main__":
+    main()
+
+# run "python -m backend.database.indexes --check"
@@ -32,6 +32,15 @@ logger.info(f"Using collection: history")
 contact_collection = db.get_collection("contact")
 logger.info(f"Using collection: contact")
 
+script_cache_collection = db.get_collection("script_cache")
+logger.info(f"Using collection: script_cache")
+
+subdomain_cache_collection = db.get_collection("subdomain_cache")
+logger.info(f"Using collection: subdomain_cache")
+
+meta_collection = db.get_collection("meta")
+logger.info(f"Using collection: meta")
+
 # GridFS 로깅
 fs = gridfs.GridFS(db)
 logger.info("GridFS initialized")
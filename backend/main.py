@@ -1,8 +1,12 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from backend.database.database import SessionLocal
 from backend.database.init_database import init_database
+from backend.database.indexes import ensure_indexes
+from backend.crawler.http_client import http_client
+from backend.crawler.cve_index import cve_index
 from backend.routes import authentication
 from backend.routes import user
 from backend.routes import crawl
@@ -46,8 +50,13 @@ async def lifespan(app: FastAPI):
     db = SessionLocal()
     try:
         init_database(db)
+        await asyncio.to_thread(ensure_indexes)
+        await http_client.start()
+        await cve_index.start()
         yield
     finally:
+        await cve_index.close()
+        await http_client.close()
         db.close()
 
 
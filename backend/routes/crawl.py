@@ -2,6 +2,7 @@ from fastapi import APIRouter, BackgroundTasks
 from pydantic import BaseModel
 from backend.crawler.validate_url import validate_url
 from backend.crawler.crawl import crawl_url
+from backend.crawler.scheduler import scheduler
 
 class URLRequest(BaseModel):
     url: str
@@ -10,6 +11,8 @@ class URLRequest(BaseModel):
 class CrawlRequest(BaseModel):
     url: str
     id: str
+    stream: bool = False
+    stream_pages: bool = False
 
 router = APIRouter()
 
@@ -17,12 +20,17 @@ router = APIRouter()
 @router.post("/validate-url")
 async def validate_url_endpoint(request: URLRequest):
     url = request.url
-    result = validate_url(url)
+    result = await validate_url(url)
 
     return result
 
 
 @router.post("/crawl")
 async def crawling(request: CrawlRequest, background_tasks: BackgroundTasks):
-    background_tasks.add_task(crawl_url, request.url, request.id)
-    return {"status": "Crawl started"}
\ No newline at end of file
+    background_tasks.add_task(crawl_url, request.url, request.id, request.stream, request.stream_pages)
+    return {"status": "Crawl started"}
+
+
+@router.get("/crawl/status")
+async def crawl_status():
+    return scheduler.stats()
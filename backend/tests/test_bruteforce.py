@@ -0,0 +1,150 @@
+import asyncio
+import struct
+import time
+from backend.crawler.bruteforce import (
+    DNSBruteForcer,
+    UDPResolver,
+    generate_candidates,
+    read_name,
+)
+from backend.crawler.sources import FixtureSource
+from backend.crawler import subdomain
+from backend.crawler.subdomain import SubdomainScanner
+
+
+class StubDNSProtocol(asyncio.DatagramProtocol):
+    """
+    테스트용 DNS 서버. records에 있는 이름은 A 레코드로, wildcards 영역 아래의 다른 이름은 와일드카드 주소로 응답하고,
+    silent에 있는 이름은 응답하지 않는다. 나머지는 NXDOMAIN.
+    """
+
+    def __init__(self, records, wildcards=None, silent=()):
+        self.records = records
+        self.wildcards = wildcards or {}
+        self.silent = set(silent)
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def answer(self, name):
+        if name in self.records:
+            return self.records[name]
+        for zone, address in self.wildcards.items():
+            if name.endswith(f".{zone}"):
+                return address
+        return None
+
+    def datagram_received(self, data, addr):
+        qid = struct.unpack('!H', data[:2])[0]
+        name, offset = read_name(data, 12)
+        if name in self.silent:
+            return
+        question = data[12:offset + 4]
+        address = self.answer(name)
+        if address is None:
+            self.transport.sendto(struct.pack('!HHHHHH', qid, 0x8183, 1, 0, 0, 0) + question, addr)
+            return
+        record = b'\xc0\x0c' + struct.pack('!HHIH', 1, 1, 60, 4) + bytes(int(part) for part in address.split('.'))
+        self.transport.sendto(struct.pack('!HHHHHH', qid, 0x8180, 1, 1, 0, 0) + question + record, addr)
+
+
+async def start_stub(records, wildcards=None, silent=()):
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: StubDNSProtocol(records, wildcards, silent), local_addr=('127.0.0.1', 0)
+    )
+    host, port = transport.get_extra_info('sockname')[:2]
+    return transport, f"{host}:{port}"
+
+
+RECORDS = {
+    'www.example.com': '192.0.2.1',
+    'api.example.com': '192.0.2.2',
+    'api-dev.example.com': '192.0.2.3',
+    'web2.example.com': '192.0.2.4',
+}
+
+
+def test_finds_existing_names_and_mutations():
+    async def run():
+        transport, nameserver = await start_stub(RECORDS)
+        try:
+            bruteforcer = DNSBruteForcer(
+                'example.com', UDPResolver(nameserver, timeout=0.5, retries=0), wordlist=['www', 'missing']
+            )
+            return await bruteforcer.run(known={'api.example.com', 'web1.example.com'})
+        finally:
+            transport.close()
+
+    # api-dev, web2는 이미 알려진 api, web1의 변형으로 찾음 / missing은 NXDOMAIN, 알려진 이름은 다시 조회하지 않음
+    assert asyncio.run(run()) == {'www.example.com', 'api-dev.example.com', 'web2.example.com'}
+
+
+def test_wildcard_answers_are_filtered():
+    async def run():
+        transport, nameserver = await start_stub(
+            {'www.example.com': '192.0.2.1'}, wildcards={'example.com': '198.51.100.1'}
+        )
+        try:
+            bruteforcer = DNSBruteForcer(
+                'example.com', UDPResolver(nameserver, timeout=0.5, retries=0), wordlist=['www', 'dev', 'test']
+            )
+            found = await bruteforcer.run()
+            return found, bruteforcer.wildcards['example.com'].result()
+        finally:
+            transport.close()
+
+    found, wildcard = asyncio.run(run())
+    # dev, test는 와일드카드 주소로만 응답하므로 제외, 주소가 다른 www만 남음
+    assert found == {'www.example.com'}
+    assert wildcard == ({'198.51.100.1'}, set())
+
+
+def test_deadline_returns_partial_results():
+    async def run():
+        transport, nameserver = await start_stub(RECORDS, silent={'slow.example.com'})
+        try:
+            bruteforcer = DNSBruteForcer(
+                'example.com', UDPResolver(nameserver, timeout=5, retries=0), wordlist=['www', 'slow'], deadline=0.5
+            )
+            started = time.monotonic()
+            found = await bruteforcer.run()
+            return found, time.monotonic() - started
+        finally:
+            transport.close()
+
+    found, elapsed = asyncio.run(run())
+    assert found == {'www.example.com'}
+    assert elapsed < 2
+
+
+def test_candidates_are_single_label():
+    candidates = generate_candidates('example.com', ['www', 'a.b'], known={'api.example.com', 'x.corp.example.com'})
+    assert 'www.example.com' in candidates
+    assert 'api-dev.example.com' in candidates
+    assert all(candidate.count('.') == 2 for candidate in candidates)
+
+
+def test_scanner_active_scan_with_stub_dns(tmp_path, monkeypatch):
+    monkeypatch.setattr(subdomain.discovery_cache, "collection", None)
+    fixture_file = tmp_path / "fixture.txt"
+    fixture_file.write_text("api.example.com\n")
+
+    async def run():
+        transport, nameserver = await start_stub(RECORDS)
+        try:
+            scanner = SubdomainScanner('example.com', sources=[FixtureSource(str(fixture_file))], deadline=5, active=False)
+            await scanner.scan()
+            await scanner.active_scan(
+                DNSBruteForcer('example.com', UDPResolver(nameserver, timeout=0.5, retries=0), wordlist=['www'])
+            )
+            return scanner
+        finally:
+            transport.close()
+
+    scanner = asyncio.run(run())
+    assert scanner.filter_subdomains(scanner.subdomains) == ['api-dev.example.com', 'api.example.com', 'www.example.com']
+    # 이미 알려진 이름은 다시 조회하지 않으므로 출처별 신뢰도가 그대로 적용됨
+    assert scanner.confidence('www.example.com') == DNSBruteForcer.confidence
+    assert scanner.confidence('api.example.com') == FixtureSource.confidence
@@ -0,0 +1,66 @@
+import json
+import os
+from backend.crawler.cve_index import CVEIndex, CVEIndexData, endpoint_tokens
+
+CVE_FILE = os.path.join(os.path.dirname(__file__), '..', 'core', 'json', 'cve.json')
+
+TREE = {
+    "url": "https://example.com/",
+    "details": {"input_tags": [{"type": "text", "id": "q"}]},
+    "children": [{"url": "https://example.com/login", "details": {"input_tags": [{"type": "email"}]}, "children": []}],
+}
+
+
+def load_index():
+    with open(CVE_FILE, 'r', encoding='utf-8') as file:
+        documents = json.load(file)['cve_list']
+    index = CVEIndex(collection=None, meta=None, refresh_seconds=0)
+    index.data = CVEIndexData(documents)
+    return index
+
+
+def endpoints():
+    return endpoint_tokens(TREE)
+
+
+def test_match_without_loaded_index_does_not_query_database():
+    # collection이 None이므로 DB를 조회하면 AttributeError가 남
+    index = CVEIndex(collection=None, meta=None, refresh_seconds=0)
+    assert index.match({"os": "", "technologies": ["php"], "frameworks": []}, endpoints()) == {}
+
+
+def test_match_reports_evidence_pages():
+    matches = load_index().match({"os": "", "technologies": [], "frameworks": ["django"]}, endpoints())
+    assert matches["CVE-2019-19844"] == ["https://example.com/login"]
+    assert "https://example.com/" in matches["CVE-2023-27163"]
+
+
+def candidate_numbers(index, software_info):
+    data = index.data
+    return {data.records[position]["cve number"] for position in index.candidates(data, software_info)}
+
+
+def test_version_ranges_with_analyzer_output():
+    index = load_index()
+    # 분석기는 버전 없는 이름과 버전 있는 이름을 함께 내보냄
+    patched = candidate_numbers(index, {"os": "", "technologies": [], "frameworks": ["jQuery", "jQuery 3.5.1"]})
+    vulnerable = candidate_numbers(index, {"os": "", "technologies": [], "frameworks": ["jQuery", "jQuery 3.4.1"]})
+    unknown = candidate_numbers(index, {"os": "", "technologies": [], "frameworks": ["jQuery"]})
+    assert "CVE-2020-11022" not in patched
+    assert "CVE-2020-11022" in vulnerable
+    assert "CVE-2020-11022" in unknown
+
+
+def test_version_range_boundaries():
+    index = load_index()
+    for version, affected in [("1.11.26", True), ("1.11.27", False), ("2.2.8", True), ("2.2.9", False),
+                              ("3.0.1rc1", True), ("3.0.1", False)]:
+        numbers = candidate_numbers(index, {"os": "Linux", "technologies": [], "frameworks": [f"Django {version}"]})
+        assert ("CVE-2019-19844" in numbers) == affected, version
+
+
+def test_normalized_product_names_match():
+    index = load_index()
+    numbers = candidate_numbers(index, {"os": "Linux", "technologies": ["Express"], "frameworks": ["Ruby on Rails 7.0.4"]})
+    # "express.js" / "ruby on rails" 로 저장된 CVE도 정규화한 이름으로 매칭
+    assert {"CVE-2022-31159", "CVE-2022-30594"} <= numbers
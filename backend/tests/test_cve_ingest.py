@@ -0,0 +1,33 @@
+from backend.core.cve import normalize_record
+
+
+def test_normalize_record_lowercases_present_fields():
+    document = normalize_record({
+        "cve number": " cve-2020-11022 ",
+        "os": "",
+        "technology": " jQuery ",
+        "framework": "jQuery",
+        "endpoint": " text ",
+        "cvss": 6.1,
+        "affected": [{"product": "jQuery", "introduced": "1.2", "fixed": "3.5.0"}, {"introduced": "1.0"}],
+    })
+    assert document == {
+        "cve number": "CVE-2020-11022",
+        "os": "",
+        "technology": "jquery",
+        "framework": "jquery",
+        "endpoint": "text",
+        "cvss": "6.1",
+        "affected": [{"product": "jquery", "introduced": "1.2", "fixed": "3.5.0"}],
+    }
+
+
+def test_normalize_record_leaves_missing_fields_out():
+    # os가 없는 항목이 {"os": ""} 조건에 새로 일치하지 않도록 빈 문자열을 채우지 않음
+    document = normalize_record({"cve number": "CVE-2024-41551", "framework": "MySQL", "endpoint": "text"})
+    assert document == {"cve number": "CVE-2024-41551", "framework": "mysql", "endpoint": "text"}
+
+
+def test_normalize_record_requires_cve_number():
+    assert normalize_record({"technology": "php"}) is None
+    assert normalize_record("CVE-2020-11022") is None
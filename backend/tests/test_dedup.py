@@ -0,0 +1,119 @@
+import asyncio
+import aiohttp
+from aiohttp import web
+from backend.config import CRAWLER_SIMHASH_DISTANCE
+from backend.crawler.dedup import ClusterIndex, hamming_distance, shingles, structure_fingerprint, url_pattern
+from backend.crawler.get_subdomains_directory import SubdomainDirectoryCrawler
+from backend.crawler.myparser import ParsedDocument
+
+
+def list_page(rows, extra=''):
+    items = ''.join(f'<tr><td><a href="/item/{i}">item {i}</a></td><td>{i}</td></tr>' for i in range(rows))
+    return (
+        '<html><head><title>list</title><script src="/app.js"></script></head><body>'
+        '<nav><ul><li><a href="/">home</a></li><li><a href="/about">about</a></li></ul></nav>'
+        '<div><h1>List</h1><form method="get" action="/search"><input type="text" name="q"><input type="submit"></form>'
+        f'<table>{items}</table>{extra}</div><footer><p>footer</p></footer></body></html>'
+    )
+
+
+def fingerprint(html):
+    return structure_fingerprint(ParsedDocument(html).structure)
+
+
+def test_url_pattern_groups_value_only_changes():
+    assert url_pattern("https://a.com/news/2024/05/01?page=3&id=7") == "a.com/news/{n}/{n}/{n}?id=*&page=*"
+    assert url_pattern("https://a.com/item/3f2a9c1e-0b1d") == "a.com/item/{id}"
+    assert url_pattern("https://a.com/post-123") == url_pattern("https://a.com/post-456") == "a.com/post-{n}"
+    assert url_pattern("https://a.com/post-1") != url_pattern("https://a.com/page-1")
+
+
+def test_shingles_keep_order_and_repetition():
+    assert shingles(["a", "b"]) == ["a\nb"]
+    assert shingles(["a", "b", "c", "a"]) == ["a\nb\nc", "b\nc\na"]
+    assert shingles([]) == []
+
+
+def test_fingerprint_reflects_repetition_and_forms():
+    # 텍스트만 다른 페이지는 같은 지문
+    assert fingerprint(list_page(20)) == fingerprint(list_page(20).replace("footer", "other"))
+    # 행 수가 크게 다르거나 폼이 추가된 페이지는 다른 클러스터
+    assert hamming_distance(fingerprint(list_page(3)), fingerprint(list_page(300))) > CRAWLER_SIMHASH_DISTANCE
+    login = '<form method="post" action="/login"><input type="password" name="pw"></form>'
+    assert hamming_distance(fingerprint(list_page(3)), fingerprint(list_page(3, login))) > CRAWLER_SIMHASH_DISTANCE
+
+
+def test_admit_link_stops_after_samples():
+    clusters = ClusterIndex(samples=2, max_distance=3)
+    nodes = [clusters.admit_link(f"https://a.com/item/{i}", lambda i=i: {"url": f"https://a.com/item/{i}"}) for i in range(5)]
+    assert [node is not None for node in nodes] == [True, True, False, False, False]
+    assert nodes[0]["represents"] == 4
+    # 이미 대표된 URL은 다시 세지 않음
+    assert clusters.admit_link("https://a.com/item/4", dict) is None
+    assert nodes[0]["represents"] == 4
+    assert clusters.admit_link("https://a.com/about", dict) == {}
+
+
+def test_admit_page_marks_structural_duplicates():
+    clusters = ClusterIndex(samples=1, max_distance=3)
+    first, second, other = {"url": "https://a.com/a"}, {"url": "https://a.com/b"}, {"url": "https://a.com/c"}
+    assert clusters.admit_page(first, fingerprint(list_page(3)))
+    assert not clusters.admit_page(second, fingerprint(list_page(3)))
+    assert second["duplicate_of"] == "https://a.com/a" and first["represents"] == 2
+    assert clusters.admit_page(other, fingerprint(list_page(300)))
+    # 지문이 없거나 samples가 0이면 항상 탐색
+    assert clusters.admit_page({"url": "x"}, None)
+    assert ClusterIndex(samples=0, max_distance=3).admit_page({"url": "x"}, 0)
+
+
+async def crawl(pages, **options):
+    async def handle(request):
+        html = pages.get(request.path_qs)
+        if html is None:
+            raise web.HTTPNotFound()
+        return web.Response(text=html, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        crawler = SubdomainDirectoryCrawler(f"http://localhost:{port}/", seed_from_site_files=False, **options)
+        async with aiohttp.ClientSession() as session:
+            return port, await crawler.crawl_bfs(session)
+    finally:
+        await runner.cleanup()
+
+
+def test_crawl_tree_records_represented_urls():
+    pages = {"/": list_page(10)}
+    pages.update({f"/item/{i}": f"<html><body><p>item {i}</p></body></html>" for i in range(10)})
+    pages["/about"] = "<html><body><h1>about</h1></body></html>"
+    port, tree = asyncio.run(crawl(pages, cluster_samples=3))
+
+    items = [child for child in tree["children"] if child["url"].startswith(f"http://localhost:{port}/item/")]
+    assert len(items) == 3
+    # 탐색하지 않은 나머지 7개 URL은 첫 표본이 대표
+    assert [child.get("represents", 1) for child in items] == [8, 1, 1]
+    assert all(child["details"] is not None for child in tree["children"])
+
+
+def test_crawl_tree_prunes_structural_duplicates():
+    # URL 패턴은 모두 다르지만 구조가 같은 페이지: samples개 이후로는 링크를 따라가지 않음
+    template = '<html><body><div><h1>{0}</h1><a href="/{0}/next">next</a></div></body></html>'
+    names = ["alpha", "beta", "gamma", "delta"]
+    pages = {"/": "<html><body>" + "".join(f'<a href="/{name}">{name}</a>' for name in names) + "</body></html>"}
+    pages.update({f"/{name}": template.format(name) for name in names})
+    pages.update({f"/{name}/next": "<html><body><p>next</p></body></html>" for name in names})
+    _, tree = asyncio.run(crawl(pages, cluster_samples=2))
+
+    explored = [child for child in tree["children"] if child["children"]]
+    duplicates = [child for child in tree["children"] if not child["children"]]
+    assert len(explored) == len(duplicates) == 2
+    assert {child["duplicate_of"] for child in duplicates} == {explored[0]["url"]}
+    assert explored[0]["represents"] == 3 and "duplicate_of" not in explored[1]
+    # 중복 페이지도 자신의 분석 결과는 그대로 가짐
+    assert all(child["details"] is not None for child in duplicates)
@@ -0,0 +1,43 @@
+import pytest
+from backend.database.indexes import ensure_indexes, check_query_plans, hot_queries, plan_stages
+
+
+@pytest.fixture(scope="module")
+def database():
+    # 실제 mongod를 임시로 띄워 실행 계획을 확인 (바이너리를 받을 수 없는 환경에서는 건너뜀)
+    pymongo_inmemory = pytest.importorskip("pymongo_inmemory")
+    try:
+        client = pymongo_inmemory.MongoClient(serverSelectionTimeoutMS=5000)
+    except Exception as e:
+        pytest.skip(f"in-memory mongod unavailable: {e}")
+    try:
+        yield client.get_database("index_check")
+    finally:
+        client.close()
+
+
+def test_plan_stages_walks_nested_plans():
+    plan = {"stage": "SUBPLAN", "inputStage": {"stage": "OR", "inputStages": [
+        {"stage": "IXSCAN"}, {"stage": "FETCH", "inputStage": {"stage": "COLLSCAN"}},
+    ]}}
+    assert set(plan_stages(plan)) == {"SUBPLAN", "OR", "IXSCAN", "FETCH", "COLLSCAN"}
+
+
+def test_hot_queries_use_indexes(database):
+    assert ensure_indexes(database) == ["cve", "history", "contact", "script_cache", "subdomain_cache"]
+    assert check_query_plans(database) == []
+
+
+def test_missing_index_is_reported(database):
+    ensure_indexes(database)
+    database.get_collection("contact").drop_indexes()
+    try:
+        assert [name for name, _ in check_query_plans(database)] == ["contact"]
+    finally:
+        ensure_indexes(database)
+
+
+def test_hot_queries_use_current_time():
+    first = dict(hot_queries())["script_cache"]["expires_at"]["$gt"]
+    second = dict(hot_queries())["script_cache"]["expires_at"]["$gt"]
+    assert second >= first and second.tzinfo is not None
@@ -0,0 +1,29 @@
+import tldextract
+from backend.crawler.publicsuffix import PublicSuffixTrie, registered_domain, strip_url
+
+HOSTS = [
+    "www.example.co.kr", "a.b.example.com", "foo.github.io", "a.b.kobe.jp", "city.kobe.jp",
+    "www.city.kawasaki.jp", "co.uk", "example.com.", "localhost",
+]
+
+
+def test_matches_tldextract_bundled_list():
+    extract = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+    for host in HOSTS:
+        expected = extract(host.rstrip('.')).registered_domain or None
+        assert registered_domain(host) == expected, host
+
+
+def test_load_rules_file_with_wildcard_and_exception(tmp_path):
+    psl = tmp_path / "public_suffix_list.dat"
+    psl.write_text("// ===BEGIN ICANN DOMAINS===\ncom\n*.ck\n!www.ck\n// ===BEGIN PRIVATE DOMAINS===\ngithub.io\n")
+    trie = PublicSuffixTrie.load(str(psl))
+    assert trie.registered_domain("a.b.example.com") == "example.com"
+    assert trie.registered_domain("a.shop.ck") == "a.shop.ck"
+    assert trie.registered_domain("www.ck") == "www.ck"
+    assert trie.registered_domain("foo.github.io") == "github.io"
+    assert PublicSuffixTrie.load(str(psl), include_private=True).registered_domain("foo.github.io") == "foo.github.io"
+
+
+def test_strip_url():
+    assert strip_url("HTTPS://user:pw@WWW.Example.com:8443/path?q=1") == "www.example.com"
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import time
+import pytest
+from backend.crawler import subdomain
+from backend.crawler.http_client import http_client
+from backend.crawler.sources import (
+    SourceError,
+    RateLimiter,
+    SubdomainSource,
+    CrtShSource,
+    HackerTargetSource,
+    FixtureSource,
+    ZoneFileSource,
+)
+from backend.crawler.subdomain import SubdomainScanner
+
+ZONE = """$ORIGIN example.com.
+@       IN SOA ns1.example.com. admin.example.com. 1 3600 600 86400 60
+        IN NS  ns1
+www     IN A   192.0.2.1
+*.dev   IN A   192.0.2.2
+api.example.com. IN CNAME www
+shop    IN A   192.0.2.3 ; 주석
+"""
+
+
+class EmptySource(SubdomainSource):
+    name = 'empty'
+
+    async def fetch(self, session, domain):
+        return
+        yield
+
+
+async def collect(source, domain):
+    return {name async for name in source.fetch(None, domain)}
+
+
+@pytest.fixture(autouse=True)
+def offline_cache(monkeypatch):
+    # 테스트에서는 MongoDB 캐시를 사용하지 않음
+    monkeypatch.setattr(subdomain.discovery_cache, "collection", None)
+
+
+def test_fixture_source_reads_json_and_lines(tmp_path):
+    json_file = tmp_path / "fixture.json"
+    json_file.write_text(json.dumps({"example.com": ["www.example.com", "API.example.com.", "other.org"]}))
+    lines_file = tmp_path / "fixture.txt"
+    lines_file.write_text("www.example.com\nmail.example.com\n\nexample.org\n")
+
+    assert asyncio.run(collect(FixtureSource(str(json_file)), "example.com")) == {"www.example.com", "api.example.com"}
+    assert asyncio.run(collect(FixtureSource(str(lines_file)), "example.com")) == {"www.example.com", "mail.example.com"}
+
+
+def test_zone_file_source_owner_names(tmp_path):
+    zone_file = tmp_path / "example.com.zone"
+    zone_file.write_text(ZONE)
+
+    assert asyncio.run(collect(ZoneFileSource(str(zone_file)), "example.com")) == {
+        "www.example.com", "dev.example.com", "api.example.com", "shop.example.com",
+    }
+
+
+def test_zone_file_source_strips_only_wildcard_prefix(tmp_path):
+    zone_file = tmp_path / "example.com.zone"
+    zone_file.write_text("$ORIGIN example.com.\n*.*x IN A 192.0.2.1\n")
+
+    assert asyncio.run(collect(ZoneFileSource(str(zone_file)), "example.com")) == {"*x.example.com"}
+
+
+def test_hackertarget_parses_csv_and_rejects_error_bodies():
+    source = HackerTargetSource()
+    assert source.parse("www.example.com,192.0.2.1\nAPI.example.com,192.0.2.2\n") == {"www.example.com", "api.example.com"}
+    assert source.parse("No records found") == set()
+    for body in ("API count exceeded - Increase Quota with Membership", "<html><body>Too many requests</body></html>"):
+        with pytest.raises(SourceError):
+            source.parse(body)
+
+
+def test_crtsh_parse_strips_wildcards():
+    body = json.dumps([{"name_value": "*.a.example.com\nb.example.com"}, {"name_value": "B.example.com"}])
+    assert CrtShSource().parse(body) == {"a.example.com", "b.example.com"}
+
+
+def test_sources_must_implement_fetch():
+    with pytest.raises(TypeError):
+        SubdomainSource()
+
+
+def test_rate_limiter_spaces_requests_without_serializing_waiters():
+    async def run():
+        limiter = RateLimiter(600)
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.wait() for _ in range(5)))
+        return time.monotonic() - started
+
+    # 0.1초 간격으로 5번: 마지막 호출이 약 0.4초 뒤에 끝남
+    assert 0.35 < asyncio.run(run()) < 0.8
+
+
+def test_scanner_merges_offline_sources(tmp_path):
+    fixture_file = tmp_path / "fixture.txt"
+    fixture_file.write_text("www.example.com\nmail.example.com\n123.example.com\nblog.example.com\n")
+    zone_file = tmp_path / "example.com.zone"
+    zone_file.write_text(ZONE)
+
+    scanner = SubdomainScanner(
+        "https://www.example.com/path",
+        sources=[FixtureSource(str(fixture_file)), ZoneFileSource(str(zone_file))],
+        deadline=5,
+        active=False,
+    )
+    assert asyncio.run(scanner.scan()) == [
+        "api.example.com", "blog.example.com", "dev.example.com", "shop.example.com", "www.example.com",
+    ]
+    # 두 출처에서 모두 찾은 이름은 신뢰도가 더 높음
+    assert scanner.confidence("www.example.com") > scanner.confidence("blog.example.com")
+
+
+def test_empty_source_result_is_not_cached(monkeypatch):
+    saved = []
+
+    async def save(domain, source, subdomains):
+        saved.append((domain, source, subdomains))
+
+    monkeypatch.setattr(subdomain.discovery_cache, "save", save)
+    source = EmptySource()
+    source.cacheable = True
+    scanner = SubdomainScanner("example.com", sources=[source], deadline=5, active=False)
+
+    assert asyncio.run(scanner.scan()) == []
+    assert saved == []
+
+
+class SlowSource(SubdomainSource):
+    name = 'slow'
+    cacheable = True
+
+    async def fetch(self, session, domain):
+        # 마감이 지난 뒤에도 세션을 사용
+        await asyncio.sleep(0.2)
+        assert not session.closed
+        yield f"late.{domain}"
+
+
+def test_source_past_deadline_fills_cache_in_background(monkeypatch):
+    saved = []
+
+    async def save(domain, source, subdomains):
+        saved.append((domain, source, subdomains))
+
+    async def run():
+        await http_client.start()
+        try:
+            scanner = SubdomainScanner("example.com", sources=[SlowSource()], deadline=0.05, active=False)
+            found = await scanner.scan()
+            await asyncio.gather(*subdomain.background_tasks)
+            return found
+        finally:
+            await http_client.close()
+
+    monkeypatch.setattr(subdomain.discovery_cache, "save", save)
+    assert asyncio.run(run()) == []
+    assert saved == [("example.com", "slow", {"late.example.com"})]